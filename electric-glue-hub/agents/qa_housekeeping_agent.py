@@ -517,7 +517,7 @@ Provide validation in JSON format with issues array."""
                 'severity_counts': result.severity_counts,
                 'issues': [
                     {
-                        'severity': issue.severity.value,
+                        'severity': issue.severity.name,
                         'type': issue.issue_type.value,
                         'description': issue.description,
                         'location': issue.location
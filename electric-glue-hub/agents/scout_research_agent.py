@@ -267,7 +267,7 @@ class ScoutResearchAgent:
                     results['qa_blocked'] = True
                     results['qa_issues'] = [
                         {
-                            'severity': issue.severity.value,
+                            'severity': issue.severity.name,
                             'type': issue.issue_type.value,
                             'description': issue.description,
                             'location': issue.location,
@@ -284,7 +284,7 @@ class ScoutResearchAgent:
                 elif qa_result.has_warnings():
                     results['qa_warnings'] = [
                         {
-                            'severity': issue.severity.value,
+                            'severity': issue.severity.name,
                             'description': issue.description
                         }
                         for issue in qa_result.issues
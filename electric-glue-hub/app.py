@@ -7,8 +7,10 @@ import streamlit as st
 import sys
 from pathlib import Path
 
-# Add to path
-sys.path.append(str(Path(__file__).parent))
+# Add to path (once; Streamlit re-executes this script on every rerun)
+_ROOT = str(Path(__file__).resolve().parent)
+if _ROOT not in sys.path:
+    sys.path.append(_ROOT)
 
 from config.branding import apply_electric_glue_theme, BRAND_COLORS
 from config.qa_status import render_qa_traffic_light, render_qa_diagnostics
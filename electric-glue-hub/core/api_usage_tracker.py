@@ -190,11 +190,25 @@ class APIUsageTracker:
             return data['summary']
 
     def get_recent_calls(self, limit: int = 10) -> List[Dict]:
-        """Get most recent API calls."""
+        """
+        Get most recent API calls.
+
+        Each call dict also carries display-ready 'date' (YYYY-MM-DD) and
+        'time' (HH:MM:SS) fields parsed once from its ISO timestamp.
+        """
         with self.lock:
             data = self._load_data()
             calls = data['calls']
-            return calls[-limit:] if calls else []
+            recent = calls[-limit:] if calls else []
+
+        for call in recent:
+            try:
+                dt = datetime.fromisoformat(call['timestamp'])
+                call['date'], call['time'] = dt.strftime('%Y-%m-%d'), dt.strftime('%H:%M:%S')
+            except ValueError:
+                call['date'], call['time'] = '', call['timestamp']
+
+        return recent
 
     def get_daily_summary(self, days: int = 7) -> Dict:
         """Get summary for last N days."""
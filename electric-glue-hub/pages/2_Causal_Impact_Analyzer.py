@@ -13,8 +13,10 @@ import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
 from io import BytesIO
 
-# Add parent to path
-sys.path.append(str(Path(__file__).parent.parent))
+# Add parent to path (once; Streamlit re-executes this script on every rerun)
+_PARENT = str(Path(__file__).resolve().parent.parent)
+if _PARENT not in sys.path:
+    sys.path.append(_PARENT)
 
 from config.branding import apply_electric_glue_theme, BRAND_COLORS, format_header
 from config.qa_status import render_qa_traffic_light
@@ -9,8 +9,10 @@ import sys
 from pathlib import Path
 from datetime import datetime
 
-# Add parent to path
-sys.path.append(str(Path(__file__).parent.parent))
+# Add parent to path (once; Streamlit re-executes this script on every rerun)
+_PARENT = str(Path(__file__).resolve().parent.parent)
+if _PARENT not in sys.path:
+    sys.path.append(_PARENT)
 
 from config.branding import apply_electric_glue_theme, BRAND_COLORS, format_header
 from config.qa_status import render_qa_traffic_light
@@ -4,16 +4,150 @@ Manage API keys for AI models and external services
 """
 
 import streamlit as st
+import streamlit.components.v1 as components
+import pandas as pd
 import sys
 import os
+import json
+import stat
+import tempfile
+from datetime import datetime
 from pathlib import Path
-from dotenv import load_dotenv, set_key, find_dotenv
 
-# Add parent to path
-sys.path.append(str(Path(__file__).parent.parent))
+# Add parent to path; guarded because Streamlit re-executes this script on every
+# rerun, and an unguarded insert would add a duplicate entry each time
+_PARENT = str(Path(__file__).resolve().parent.parent)
+if _PARENT not in sys.path:
+    sys.path.insert(0, _PARENT)
+
+from config.branding import CUSTOM_CSS, BRAND_COLORS, format_header
+
+# Short names for the brand colours used throughout the page
+PRIMARY = BRAND_COLORS['primary']
+SECONDARY = BRAND_COLORS['secondary']
+ACCENT = BRAND_COLORS['accent']
+SUCCESS = BRAND_COLORS['success']
+WARNING = BRAND_COLORS['warning']
+TEXT = BRAND_COLORS['text']
+
+# HTML templates with the brand colours filled in; per-run values go through .format().
+# (This is page-script code, so the templates are rebuilt on every rerun like any other statement.)
+_PROVIDER_CARD_HTML = """
+<div style='background: white; padding: 1.5rem; border-radius: 10px; box-shadow: 0 2px 8px rgba(0,0,0,0.05);
+            border-left: 4px solid {color}; margin: 1.5rem 0 1rem 0;'>
+    <h4 style='color: {color}; margin-top: 0;'>{emoji} {title}</h4>
+    <p style='color: #666; font-size: 0.95rem; line-height: 1.6;'>
+        {description} Get your API key from
+        <a href='{url}' target='_blank' style='color: {color};'>
+            {link_text}
+        </a>
+    </p>
+</div>
+"""
+
+_ENV_FILE_CARD_HTML = f"""
+<div style='flex: 1; background: white; padding: 2rem; border-radius: 12px; box-shadow: 0 4px 12px rgba(0,0,0,0.06);'>
+    <h4 style='color: {PRIMARY};'>📁 Environment File</h4>
+    <p style='color: #666; font-size: 0.95rem;'>
+        <strong>Location:</strong><br/>
+        <code style='background: #f5f5f5; padding: 0.3rem 0.5rem; border-radius: 4px; font-size: 0.85rem;'>
+            {{env_path}}
+        </code>
+    </p>
+    <p style='color: #666; font-size: 0.95rem; margin-top: 1rem;'>
+        <strong>Status:</strong> {{env_status}}
+    </p>
+</div>
+"""
+
+_LLM_AVAILABILITY_HTML = f"""
+<div style='flex: 1; background: white; padding: 2rem; border-radius: 12px; box-shadow: 0 4px 12px rgba(0,0,0,0.06);'>
+    <h4 style='color: {ACCENT};'>🔌 LLM Availability</h4>
+    <p style='color: #666; font-size: 0.95rem;'>
+        <strong>OpenAI:</strong> <span style='color: {{openai_color}};'>{{openai_status}}</span><br/>
+        <strong>Anthropic:</strong> <span style='color: {{anthropic_color}};'>{{anthropic_status}}</span>
+    </p>
+    <p style='color: #666; font-size: 0.85rem; margin-top: 1rem; font-style: italic;'>
+        At least one LLM provider is required for AI-powered features.
+    </p>
+</div>
+"""
+
+# Side-by-side card row; cards inside it use flex: 1 to share the width
+_CARD_ROW_HTML = "<div style='display: flex; gap: {gap}; margin-bottom: 1.5rem;'>{cards}</div>"
+
+_USAGE_PROVIDER_CARD_HTML = """
+<div style='flex: 1; background: white; padding: 1.5rem; border-radius: 12px;
+            box-shadow: 0 4px 12px rgba(0,0,0,0.06); border-top: 4px solid {color};'>
+    <h4 style='color: {color}; margin: 0 0 1rem 0; font-size: 1.2rem;'>
+        {icon} {provider}
+    </h4>
+    <p style='margin: 0.5rem 0; color: #666; font-size: 0.9rem;'>
+        <strong>Calls:</strong> {calls:,}<br/>
+        <strong>Tokens:</strong> {tokens:,}<br/>
+        <strong>Cost:</strong> ${cost:.4f}
+    </p>
+</div>
+"""
+
+_USAGE_INTRO_HTML = """
+---
+
+## 📊 API Usage & Cost Tracking
+
+<div style='background: linear-gradient(135deg, rgba(0,255,255,0.05) 0%, rgba(0,0,0,0.05) 100%);
+            padding: 1.5rem; border-radius: 12px; margin-bottom: 2rem;'>
+    <p style='font-size: 0.95rem; line-height: 1.6; color: #666; margin: 0;'>
+        Track API usage and estimated costs across all Electric Glue products.
+        Costs are estimated based on current pricing and may vary slightly from actual billing.
+    </p>
+</div>
+"""
+
+# Recent-calls list rendered in the browser: the calls ship as a JSON island and a
+# small script clones the row template for each one. Filled via % with primary/calls.
+_RECENT_CALLS_HTML = """
+<div id='calls' style='font-family: "Source Sans Pro", sans-serif;'></div>
+<template id='row'>
+<div class='card' style='background: #f8f9fa; padding: 1rem; border-radius: 8px; margin-bottom: 0.5rem; border-left: 3px solid;'>
+    <div style='display: flex; justify-content: space-between; align-items: center;'>
+        <div>
+            <strong class='op'></strong><br/>
+            <span class='meta' style='font-size: 0.85rem; color: #666;'></span>
+        </div>
+        <div style='text-align: right;'>
+            <strong class='cost' style='color: %(primary)s;'></strong><br/>
+            <span class='tokens' style='font-size: 0.85rem; color: #999;'></span>
+        </div>
+    </div>
+</div>
+</template>
+<script type='application/json' id='data'>%(calls)s</script>
+<script>
+const calls = JSON.parse(document.getElementById('data').textContent);
+const row = document.getElementById('row').content;
+const out = document.getElementById('calls');
+const title = s => s.replace(/_/g, ' ').replace(/\\b\\w/g, ch => ch.toUpperCase());
+for (const c of calls.reverse()) {
+    const el = row.cloneNode(true);
+    const model = c.model.length > 30 ? c.model.slice(0, 30) + '...' : c.model;
+    el.querySelector('.card').style.borderLeftColor = c.success ? '#00FF00' : '#FF0000';
+    el.querySelector('.op').textContent = (c.success ? '✅ ' : '❌ ') + title(c.operation);
+    el.querySelector('.meta').textContent = `${c.provider} • ${model} • ${c.date} ${c.time}`;
+    el.querySelector('.cost').textContent = '$' + c.estimated_cost.toFixed(4);
+    el.querySelector('.tokens').textContent = c.total_tokens.toLocaleString('en-US') + ' tokens';
+    out.appendChild(el);
+}
+</script>
+"""
 
-from config.branding import apply_electric_glue_theme, BRAND_COLORS, format_header
-from core.api_usage_tracker import get_tracker
+# Display names for tracked operations; unknown operations fall back to title case
+_OP_DISPLAY = {
+    'qa_validation': '🚦 QA Validation',
+    'scout_research': '🧠 Scout Research',
+    'perspective_generation': '🎭 Perspective Generation',
+    'web_search': '🔍 Web Search'
+}
 
 # Page config
 st.set_page_config(
@@ -22,14 +156,19 @@ st.set_page_config(
     layout="wide"
 )
 
-# Apply branding
-apply_electric_glue_theme()
+# Apply branding and header
+@st.cache_data(show_spinner=False)
+def _themed_header() -> str:
+    """Theme stylesheet plus page header, built once and injected as one block."""
+    return CUSTOM_CSS + format_header(
+        "⚙️ Settings",
+        "Configure API Keys and System Settings"
+    )
+
 
-# Header
-st.markdown(format_header(
-    "⚙️ Settings",
-    "Configure API Keys and System Settings"
-), unsafe_allow_html=True)
+# Streamlit drops elements that are not re-emitted on a rerun, so the (cached)
+# stylesheet still has to be written every pass or the page loses its theme.
+st.markdown(_themed_header(), unsafe_allow_html=True)
 
 # Navigation
 if st.button("← Back to Home"):
@@ -37,14 +176,14 @@ if st.button("← Back to Home"):
 
 st.markdown("---")
 
-# Load environment variables
-load_dotenv()
-
 # Overview
-st.markdown(f"""
+@st.cache_data(show_spinner=False)
+def _intro_html() -> str:
+    """Overview card and API Keys heading, emitted as one markdown block."""
+    return f"""
 <div style='background: linear-gradient(135deg, rgba(0,255,0,0.05) 0%, rgba(0,0,0,0.05) 100%);
-            padding: 2rem; border-radius: 12px; border-left: 5px solid {BRAND_COLORS['primary']};'>
-    <h3 style='color: {BRAND_COLORS['secondary']}; margin-top: 0;'>🔑 API Key Management</h3>
+            padding: 2rem; border-radius: 12px; border-left: 5px solid {PRIMARY};'>
+    <h3 style='color: {SECONDARY}; margin-top: 0;'>🔑 API Key Management</h3>
     <p style='font-size: 1.05rem; line-height: 1.8; color: #555;'>
         Configure API keys for AI models (OpenAI, Anthropic) and external services.
         Your keys are stored securely in a <code>.env</code> file and never transmitted beyond your local environment.
@@ -54,380 +193,523 @@ st.markdown(f"""
         or commit it to version control. Each team member should configure their own keys.
     </p>
 </div>
-""", unsafe_allow_html=True)
+<h2 style='margin-top: 1.5rem;'>🔐 API Keys</h2>
+"""
 
-st.markdown("<br>", unsafe_allow_html=True)
 
-# API Keys Configuration
-st.markdown(f"## 🔐 API Keys")
+st.markdown(_intro_html(), unsafe_allow_html=True)
 
 # Get .env file path
-env_path = find_dotenv()
+@st.cache_resource(show_spinner=False)
+def _get_env_path():
+    """Locate the .env file once per process rather than on every rerun."""
+    from dotenv import find_dotenv
+    return find_dotenv()
+
+
+env_path = _get_env_path()
 if not env_path:
     env_path = Path(__file__).parent.parent / ".env"
-    # Create .env if it doesn't exist
-    if not env_path.exists():
-        env_path.touch()
+    # Create .env if it doesn't exist (checked once per session)
+    if 'env_created' not in st.session_state:
+        if not env_path.exists():
+            env_path.touch()
+        st.session_state['env_created'] = True
+
+
+# Load environment variables (parsed once per process, re-parsed after a save)
+@st.cache_resource(show_spinner=False)
+def _load_env(env_path: str) -> dict:
+    """Load the .env file into os.environ and return a snapshot of the API keys."""
+    from dotenv import load_dotenv
+    load_dotenv(env_path)
+    return {name: os.getenv(name, '') for name in ('OPENAI_API_KEY', 'ANTHROPIC_API_KEY')}
+
+
+env_snapshot = _load_env(str(env_path))
+
+
+def _format_env_line(key: str, value: str, export: bool = False) -> str:
+    """
+    Format a KEY='value' line the way dotenv's set_key does.
+
+    Every value is single-quoted with backslashes and quotes escaped, so values
+    containing ``#``, quotes or whitespace read back unchanged.
+    """
+    escaped = value.replace('\\', '\\\\').replace("'", "\\'")
+    line = f"{key}='{escaped}'"
+    return f"export {line}" if export else line
+
+
+def _env_line_key(line: str):
+    """Return (key, has_export_prefix) for a KEY=value line, or (None, False)."""
+    stripped = line.strip()
+    if not stripped or stripped.startswith('#') or '=' not in stripped:
+        return None, False
+    key = stripped.split('=', 1)[0].strip()
+    if key.startswith('export '):
+        return key[len('export '):].strip(), True
+    return key, False
+
+
+def _batch_set_keys(env_path, pairs: dict):
+    """
+    Write several KEY=value pairs to the .env file in one read/rewrite.
+
+    Existing keys (including ``export KEY=...`` lines) are overwritten in place,
+    missing keys are appended, and the file is replaced atomically so a failed
+    write never leaves it truncated. The replacement keeps the original file's
+    permissions; a new file is created owner-only (0600).
+    """
+    env_file = Path(env_path)
+    lines = env_file.read_text().splitlines() if env_file.exists() else []
+    remaining = dict(pairs)
+
+    for i, line in enumerate(lines):
+        key, export = _env_line_key(line)
+        if key in remaining:
+            lines[i] = _format_env_line(key, remaining.pop(key), export)
+
+    lines.extend(_format_env_line(key, value) for key, value in remaining.items())
+
+    fd, tmp_name = tempfile.mkstemp(dir=env_file.parent, prefix=env_file.name + '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w') as f:
+            f.write("\n".join(lines) + "\n")
+        if env_file.exists():
+            os.chmod(tmp_name, stat.S_IMODE(os.stat(env_file).st_mode))
+        os.replace(tmp_name, env_file)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def _set_env_key(env_path, key: str, value: str):
+    """Set a single key in the .env file (plain line scan, no dotenv regex parse)."""
+    _batch_set_keys(env_path, {key: value})
+
+
+def _save_key(env_name: str, input_key: str, provider: str):
+    """Button callback: persist the key typed into ``input_key`` before the rerun."""
+    key_value = st.session_state.get(input_key, '')
+    if not key_value:
+        st.session_state[f'{env_name}_notice'] = ('warning', "Please enter an API key")
+        return
+    if key_value == st.session_state.get(env_name):
+        st.session_state[f'{env_name}_notice'] = ('info', f"{provider} API key unchanged")
+        return
+    try:
+        _set_env_key(env_path, env_name, key_value)
+        _load_env.clear()
+        st.session_state['env_exists'] = True
+        os.environ[env_name] = key_value
+        st.session_state[env_name] = key_value
+        st.session_state['keys_changed'] = True
+        st.session_state[f'{env_name}_notice'] = ('success', f"✓ {provider} API key saved successfully!")
+    except Exception as e:
+        st.session_state[f'{env_name}_notice'] = ('error', f"Error saving API key: {e}")
+
+
+def _remove_key(env_name: str, provider: str):
+    """Button callback: blank the stored key before the rerun."""
+    if not st.session_state.get(env_name):
+        st.session_state[f'{env_name}_notice'] = ('info', f"No {provider} API key to remove")
+        return
+    try:
+        _set_env_key(env_path, env_name, '')
+        _load_env.clear()
+        st.session_state['env_exists'] = True
+        os.environ.pop(env_name, None)
+        st.session_state[env_name] = ''
+        st.session_state['keys_changed'] = True
+        st.session_state[f'{env_name}_notice'] = ('success', f"✓ {provider} API key removed")
+    except Exception as e:
+        st.session_state[f'{env_name}_notice'] = ('error', f"Error removing API key: {e}")
+
+
+def _save_both_keys():
+    """Button callback: persist both typed keys with a single .env rewrite."""
+    changed_keys = {
+        p['env']: st.session_state.get(p['input_key'], '') for p in PROVIDERS
+        if st.session_state.get(p['input_key'], '') != st.session_state.get(p['env'])
+    }
+    if not changed_keys:
+        st.session_state['both_keys_notice'] = ('info', "API keys unchanged")
+        return
+    try:
+        _batch_set_keys(env_path, changed_keys)
+        _load_env.clear()
+        st.session_state['env_exists'] = True
+        for key_name, key_value in changed_keys.items():
+            os.environ[key_name] = key_value
+            st.session_state[key_name] = key_value
+        names = " and ".join(p['name'] for p in PROVIDERS)
+        st.session_state['both_keys_notice'] = ('success', f"✓ {names} API keys saved successfully!")
+    except Exception as e:
+        st.session_state['both_keys_notice'] = ('error', f"Error saving API keys: {e}")
+
+
+def _mask(key: str) -> str:
+    """Mask an API key for display, keeping only its prefix and last four characters."""
+    return f"{key[:8]}...{key[-4:]}" if len(key) > 12 else "***"
+
+
+# Status label, colour and availability label for a configured (True) / missing (False) key
+_KEY_STATUS = {
+    True: ("✓ Configured", SUCCESS, "✓ Available"),
+    False: ("⚠️ Not Configured", WARNING, "⚠️ Not configured")
+}
+
+
+def _on_key_input():
+    """
+    Text input callback: flag a full rerun when "both inputs filled" flips.
+
+    The inputs live in per-provider fragments, so typing only reruns that
+    fragment; the page-level Save Both button would otherwise not appear (or
+    disappear) until an unrelated full rerun.
+    """
+    both_filled = all(st.session_state.get(p['input_key']) for p in PROVIDERS)
+    if both_filled != st.session_state.get('both_keys_filled', False):
+        st.session_state['both_keys_filled'] = both_filled
+        st.session_state['both_keys_toggled'] = True
+
+
+def _show_notice(notice_key: str):
+    """Display (once) a message left behind by a save/remove callback."""
+    notice = st.session_state.pop(notice_key, None)
+    if notice:
+        level, message = notice
+        getattr(st, level)(message)
+
+
+# Provider definitions driving the API key sections below
+PROVIDERS = [
+    {
+        'name': 'OpenAI',
+        'title': 'OpenAI API Key',
+        'env': 'OPENAI_API_KEY',
+        'input_key': 'openai_key_input',
+        'prefix': 'sk-',
+        'color': PRIMARY,
+        'emoji': '🤖',
+        'description': 'Used by Product 2 (Scout) for multi-perspective analysis.',
+        'url': 'https://platform.openai.com/api-keys',
+        'link_text': 'OpenAI Platform'
+    },
+    {
+        'name': 'Anthropic',
+        'title': 'Anthropic API Key (Claude)',
+        'env': 'ANTHROPIC_API_KEY',
+        'input_key': 'anthropic_key_input',
+        'prefix': 'sk-ant-',
+        'color': ACCENT,
+        'emoji': '🧠',
+        'description': 'Alternative AI provider for analysis tasks.',
+        'url': 'https://console.anthropic.com/account/keys',
+        'link_text': 'Anthropic Console'
+    }
+]
+
+
+@st.fragment
+def _render_provider(p: dict):
+    """
+    Render one provider's card, status row and key configuration.
+
+    Runs as a fragment so interacting with one provider's inputs does not rerun
+    the rest of the page. A save/remove escalates to a full rerun so the System
+    Information panel picks up the new key, as does filling or clearing the
+    second key input so the Save Both Keys button is shown or hidden.
+    """
+    keys_changed = st.session_state.pop('keys_changed', False)
+    if st.session_state.pop('both_keys_toggled', False) or keys_changed:
+        st.rerun(scope="app")
+
+    # Card and status markup only change with the stored key, so keep them in
+    # session state keyed on its hash and rebuild only when the key changes
+    current_key = st.session_state.setdefault(p['env'], env_snapshot.get(p['env'], ''))
+    chrome_key = f"{p['env']}_chrome"
+    chrome = st.session_state.get(chrome_key)
+    if chrome is None or chrome[0] != hash(current_key):
+        status, status_color, _ = _KEY_STATUS[bool(current_key)]
+        chrome = (
+            hash(current_key),
+            _PROVIDER_CARD_HTML.format(**p),
+            f"**Current Status:** <span style='color: {status_color}; font-weight: 600;'>{status}</span>",
+            _mask(current_key) if current_key else '',
+        )
+        st.session_state[chrome_key] = chrome
+    _, card_html, status_line, masked_key = chrome
+
+    st.markdown(card_html, unsafe_allow_html=True)
+
+    if current_key:
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            st.markdown(status_line, unsafe_allow_html=True)
+        with col2:
+            st.code(masked_key, language=None)
+    else:
+        st.markdown(status_line, unsafe_allow_html=True)
+
+    # API Key Input
+    with st.expander(f"🔧 Configure {p['name']} API Key", expanded=not bool(current_key)):
+        st.text_input(
+            f"Enter {p['name']} API Key",
+            key=p['input_key'],
+            type="password",
+            placeholder=f"{p['prefix']}...",
+            help=f"Your {p['name']} API key (starts with '{p['prefix']}')",
+            on_change=_on_key_input
+        )
+
+        col1, col2 = st.columns([1, 1])
+        with col1:
+            st.button(
+                f"💾 Save {p['name']} Key", width='stretch',
+                on_click=_save_key, args=(p['env'], p['input_key'], p['name'])
+            )
 
-# OpenAI Configuration
-st.markdown(f"""
-<div style='background: white; padding: 1.5rem; border-radius: 10px; box-shadow: 0 2px 8px rgba(0,0,0,0.05);
-            border-left: 4px solid {BRAND_COLORS['primary']};'>
-    <h4 style='color: {BRAND_COLORS['primary']}; margin-top: 0;'>🤖 OpenAI API Key</h4>
-    <p style='color: #666; font-size: 0.95rem; line-height: 1.6;'>
-        Used by Product 2 (Scout) for multi-perspective analysis. Get your API key from
-        <a href='https://platform.openai.com/api-keys' target='_blank' style='color: {BRAND_COLORS['primary']};'>
-            OpenAI Platform
-        </a>
-    </p>
-</div>
-""", unsafe_allow_html=True)
-
-st.markdown("<br>", unsafe_allow_html=True)
-
-# Check current OpenAI key status
-current_openai_key = os.getenv('OPENAI_API_KEY', '')
-openai_status = "✓ Configured" if current_openai_key else "⚠️ Not Configured"
-openai_status_color = BRAND_COLORS['success'] if current_openai_key else BRAND_COLORS['warning']
-
-col1, col2 = st.columns([3, 1])
-with col1:
-    st.markdown(f"**Current Status:** <span style='color: {openai_status_color}; font-weight: 600;'>{openai_status}</span>", unsafe_allow_html=True)
-with col2:
-    if current_openai_key:
-        masked_key = current_openai_key[:8] + "..." + current_openai_key[-4:] if len(current_openai_key) > 12 else "***"
-        st.code(masked_key, language=None)
-
-# OpenAI API Key Input
-with st.expander("🔧 Configure OpenAI API Key", expanded=not bool(current_openai_key)):
-    openai_key_input = st.text_input(
-        "Enter OpenAI API Key",
-        value="",
-        type="password",
-        placeholder="sk-...",
-        help="Your OpenAI API key (starts with 'sk-')"
-    )
+        with col2:
+            if current_key:
+                st.button(
+                    f"🗑️ Remove {p['name']} Key", width='stretch',
+                    on_click=_remove_key, args=(p['env'], p['name'])
+                )
 
-    col1, col2 = st.columns([1, 1])
-    with col1:
-        if st.button("💾 Save OpenAI Key", width='stretch'):
-            if openai_key_input:
-                try:
-                    set_key(env_path, 'OPENAI_API_KEY', openai_key_input)
-                    os.environ['OPENAI_API_KEY'] = openai_key_input
-                    st.success("✓ OpenAI API key saved successfully!")
-                    st.rerun()
-                except Exception as e:
-                    st.error(f"Error saving API key: {e}")
-            else:
-                st.warning("Please enter an API key")
+        _show_notice(f"{p['env']}_notice")
 
-    with col2:
-        if current_openai_key and st.button("🗑️ Remove OpenAI Key", width='stretch'):
-            try:
-                set_key(env_path, 'OPENAI_API_KEY', '')
-                os.environ.pop('OPENAI_API_KEY', None)
-                st.success("✓ OpenAI API key removed")
-                st.rerun()
-            except Exception as e:
-                st.error(f"Error removing API key: {e}")
-
-st.markdown("<br>", unsafe_allow_html=True)
-
-# Anthropic Configuration
-st.markdown(f"""
-<div style='background: white; padding: 1.5rem; border-radius: 10px; box-shadow: 0 2px 8px rgba(0,0,0,0.05);
-            border-left: 4px solid {BRAND_COLORS['accent']};'>
-    <h4 style='color: {BRAND_COLORS['accent']}; margin-top: 0;'>🧠 Anthropic API Key (Claude)</h4>
-    <p style='color: #666; font-size: 0.95rem; line-height: 1.6;'>
-        Alternative AI provider for analysis tasks. Get your API key from
-        <a href='https://console.anthropic.com/account/keys' target='_blank' style='color: {BRAND_COLORS['accent']};'>
-            Anthropic Console
-        </a>
-    </p>
-</div>
-""", unsafe_allow_html=True)
-
-st.markdown("<br>", unsafe_allow_html=True)
-
-# Check current Anthropic key status
-current_anthropic_key = os.getenv('ANTHROPIC_API_KEY', '')
-anthropic_status = "✓ Configured" if current_anthropic_key else "⚠️ Not Configured"
-anthropic_status_color = BRAND_COLORS['success'] if current_anthropic_key else BRAND_COLORS['warning']
-
-col1, col2 = st.columns([3, 1])
-with col1:
-    st.markdown(f"**Current Status:** <span style='color: {anthropic_status_color}; font-weight: 600;'>{anthropic_status}</span>", unsafe_allow_html=True)
-with col2:
-    if current_anthropic_key:
-        masked_key = current_anthropic_key[:8] + "..." + current_anthropic_key[-4:] if len(current_anthropic_key) > 12 else "***"
-        st.code(masked_key, language=None)
-
-# Anthropic API Key Input
-with st.expander("🔧 Configure Anthropic API Key", expanded=not bool(current_anthropic_key)):
-    anthropic_key_input = st.text_input(
-        "Enter Anthropic API Key",
-        value="",
-        type="password",
-        placeholder="sk-ant-...",
-        help="Your Anthropic API key (starts with 'sk-ant-')"
-    )
 
-    col1, col2 = st.columns([1, 1])
-    with col1:
-        if st.button("💾 Save Anthropic Key", width='stretch'):
-            if anthropic_key_input:
-                try:
-                    set_key(env_path, 'ANTHROPIC_API_KEY', anthropic_key_input)
-                    os.environ['ANTHROPIC_API_KEY'] = anthropic_key_input
-                    st.success("✓ Anthropic API key saved successfully!")
-                    st.rerun()
-                except Exception as e:
-                    st.error(f"Error saving API key: {e}")
-            else:
-                st.warning("Please enter an API key")
+for provider in PROVIDERS:
+    _render_provider(provider)
 
-    with col2:
-        if current_anthropic_key and st.button("🗑️ Remove Anthropic Key", width='stretch'):
-            try:
-                set_key(env_path, 'ANTHROPIC_API_KEY', '')
-                os.environ.pop('ANTHROPIC_API_KEY', None)
-                st.success("✓ Anthropic API key removed")
-                st.rerun()
-            except Exception as e:
-                st.error(f"Error removing API key: {e}")
+_, openai_status_color, openai_availability = _KEY_STATUS[bool(st.session_state['OPENAI_API_KEY'])]
+_, anthropic_status_color, anthropic_availability = _KEY_STATUS[bool(st.session_state['ANTHROPIC_API_KEY'])]
 
-st.markdown("<br><br>", unsafe_allow_html=True)
+# Save both keys with a single .env rewrite when both inputs are filled
+if all(st.session_state.get(p['input_key']) for p in PROVIDERS):
+    st.button("💾 Save Both Keys", width='stretch', on_click=_save_both_keys)
+_show_notice('both_keys_notice')
 
 # System Information
-st.markdown("---")
-st.markdown(f"## 💻 System Information")
-
-col1, col2 = st.columns(2, gap="large")
-
-with col1:
-    st.markdown(f"""
-    <div style='background: white; padding: 2rem; border-radius: 12px; box-shadow: 0 4px 12px rgba(0,0,0,0.06);'>
-        <h4 style='color: {BRAND_COLORS['primary']};'>📁 Environment File</h4>
-        <p style='color: #666; font-size: 0.95rem;'>
-            <strong>Location:</strong><br/>
-            <code style='background: #f5f5f5; padding: 0.3rem 0.5rem; border-radius: 4px; font-size: 0.85rem;'>
-                {env_path}
-            </code>
-        </p>
-        <p style='color: #666; font-size: 0.95rem; margin-top: 1rem;'>
-            <strong>Status:</strong> {'✓ File exists' if Path(env_path).exists() else '⚠️ File not found'}
-        </p>
-    </div>
-    """, unsafe_allow_html=True)
-
-with col2:
-    st.markdown(f"""
-    <div style='background: white; padding: 2rem; border-radius: 12px; box-shadow: 0 4px 12px rgba(0,0,0,0.06);'>
-        <h4 style='color: {BRAND_COLORS['accent']};'>🔌 LLM Availability</h4>
-        <p style='color: #666; font-size: 0.95rem;'>
-            <strong>OpenAI:</strong> <span style='color: {openai_status_color};'>{'✓ Available' if current_openai_key else '⚠️ Not configured'}</span><br/>
-            <strong>Anthropic:</strong> <span style='color: {anthropic_status_color};'>{'✓ Available' if current_anthropic_key else '⚠️ Not configured'}</span>
-        </p>
-        <p style='color: #666; font-size: 0.85rem; margin-top: 1rem; font-style: italic;'>
-            At least one LLM provider is required for AI-powered features.
-        </p>
-    </div>
-    """, unsafe_allow_html=True)
-
-st.markdown("<br>", unsafe_allow_html=True)
+# .env existence only changes when a key is saved, so stat it once per session
+if 'env_exists' not in st.session_state:
+    st.session_state['env_exists'] = Path(env_path).exists()
+env_exists = st.session_state['env_exists']
+
+st.divider()
+st.markdown("## 💻 System Information")
+
+st.markdown(_CARD_ROW_HTML.format(gap='3rem', cards=(
+    _ENV_FILE_CARD_HTML.format(
+        env_path=env_path,
+        env_status='✓ File exists' if env_exists else '⚠️ File not found'
+    ) + _LLM_AVAILABILITY_HTML.format(
+        openai_color=openai_status_color,
+        openai_status=openai_availability,
+        anthropic_color=anthropic_status_color,
+        anthropic_status=anthropic_availability
+    )
+)), unsafe_allow_html=True)
 
 # API Usage Tracking
-st.markdown("---")
-st.markdown(f"## 📊 API Usage & Cost Tracking")
-
-st.markdown("""
-<div style='background: linear-gradient(135deg, rgba(0,255,255,0.05) 0%, rgba(0,0,0,0.05) 100%);
-            padding: 1.5rem; border-radius: 12px; margin-bottom: 2rem;'>
-    <p style='font-size: 0.95rem; line-height: 1.6; color: #666; margin: 0;'>
-        Track API usage and estimated costs across all Electric Glue products.
-        Costs are estimated based on current pricing and may vary slightly from actual billing.
-    </p>
-</div>
-""", unsafe_allow_html=True)
+st.markdown(_USAGE_INTRO_HTML, unsafe_allow_html=True)
 
 # Load usage tracker
-tracker = get_tracker()
-summary = tracker.get_summary()
-daily_stats = tracker.get_daily_summary(days=7)
-
-# Overall Summary
-col1, col2, col3, col4 = st.columns(4)
-
-with col1:
-    st.metric(
-        "Total API Calls",
-        f"{summary['total_calls']:,}",
-        help="Total number of API calls made"
-    )
+@st.cache_resource(show_spinner=False)
+def _tracker():
+    """Process-wide usage tracker, constructed once and shared across sessions."""
+    from core.api_usage_tracker import get_tracker
+    return get_tracker()
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _cached_summary(mtime: float) -> dict:
+    """Usage summary, re-read only when the tracker file changes (keyed on mtime)."""
+    summary = dict(_tracker().get_summary())
+    calls = summary['total_calls']
+    summary['avg_cost_per_call'] = summary['total_cost'] / calls if calls > 0 else 0
+    summary['by_operation'] = {
+        operation: {**stats, 'display_name': _OP_DISPLAY.get(operation) or operation.replace('_', ' ').title()}
+        for operation, stats in summary['by_operation'].items()
+    }
+    return summary
 
-with col2:
-    st.metric(
-        "Total Tokens",
-        f"{summary['total_tokens']:,}",
-        help="Total tokens processed (input + output)"
-    )
 
-with col3:
-    st.metric(
-        "Estimated Cost",
-        f"${summary['total_cost']:.4f}",
-        help="Estimated total cost in USD"
-    )
+@st.cache_data(persist="disk", max_entries=16, show_spinner=False)
+def _cached_daily(mtime: float, days: int, hour_bucket: str) -> dict:
+    """
+    Daily usage breakdown, persisted to disk so it survives server restarts.
 
-with col4:
-    avg_cost_per_call = summary['total_cost'] / summary['total_calls'] if summary['total_calls'] > 0 else 0
-    st.metric(
-        "Avg Cost/Call",
-        f"${avg_cost_per_call:.4f}",
-        help="Average cost per API call"
-    )
+    Keyed on the tracker mtime (new calls) and the current hour (the rolling
+    window moving forward); persisted caches ignore ttl, so the hour bucket
+    stands in for it.
+    """
+    return _tracker().get_daily_summary(days=days)
 
-st.markdown("<br>", unsafe_allow_html=True)
-
-# Breakdown by Provider
-if summary['by_provider']:
-    st.markdown("### 🔑 Usage by Provider")
-
-    cols = st.columns(len(summary['by_provider']))
-
-    for idx, (provider, stats) in enumerate(summary['by_provider'].items()):
-        with cols[idx]:
-            color = BRAND_COLORS['primary'] if provider == 'openai' else BRAND_COLORS['accent']
-            icon = "🤖" if provider == 'openai' else "🧠"
-
-            st.markdown(f"""
-            <div style='background: white; padding: 1.5rem; border-radius: 12px;
-                        box-shadow: 0 4px 12px rgba(0,0,0,0.06); border-top: 4px solid {color};'>
-                <h4 style='color: {color}; margin: 0 0 1rem 0; font-size: 1.2rem;'>
-                    {icon} {provider.upper()}
-                </h4>
-                <p style='margin: 0.5rem 0; color: #666; font-size: 0.9rem;'>
-                    <strong>Calls:</strong> {stats['calls']:,}<br/>
-                    <strong>Tokens:</strong> {stats['tokens']:,}<br/>
-                    <strong>Cost:</strong> ${stats['cost']:.4f}
-                </p>
-            </div>
-            """, unsafe_allow_html=True)
-
-    st.markdown("<br>", unsafe_allow_html=True)
-
-# Breakdown by Operation
-if summary['by_operation']:
-    st.markdown("### ⚡ Usage by Operation")
-
-    operation_names = {
-        'qa_validation': '🚦 QA Validation',
-        'scout_research': '🧠 Scout Research',
-        'perspective_generation': '🎭 Perspective Generation',
-        'web_search': '🔍 Web Search'
-    }
 
-    for operation, stats in summary['by_operation'].items():
-        display_name = operation_names.get(operation, operation.replace('_', ' ').title())
+@st.cache_data(ttl=30, show_spinner=False)
+def _cached_recent(mtime: float, limit: int) -> list:
+    """Recent calls with pre-parsed date/time, re-read only when the tracker file changes."""
+    return _tracker().get_recent_calls(limit=limit)
 
-        col1, col2, col3, col4 = st.columns([3, 2, 2, 2])
 
-        with col1:
-            st.markdown(f"**{display_name}**")
-        with col2:
-            st.caption(f"{stats['calls']:,} calls")
-        with col3:
-            st.caption(f"{stats['tokens']:,} tokens")
-        with col4:
-            st.caption(f"${stats['cost']:.4f}")
-
-    st.markdown("<br>", unsafe_allow_html=True)
-
-# Daily Usage Chart
-if daily_stats:
-    st.markdown("### 📅 Last 7 Days")
-
-    import pandas as pd
-
-    # Convert to DataFrame for display
-    daily_data = []
-    for date, stats in sorted(daily_stats.items()):
-        daily_data.append({
-            'Date': date,
-            'Calls': stats['calls'],
-            'Tokens': stats['tokens'],
-            'Cost ($)': round(stats['cost'], 4)
-        })
-
-    if daily_data:
-        df = pd.DataFrame(daily_data)
-        st.dataframe(df, width='stretch', hide_index=True)
+
+@st.cache_data(show_spinner=False)
+def _daily_df(daily_items: tuple):
+    """Daily usage table indexed by date, shared by the table and chart."""
+    return pd.DataFrame.from_records(
+        [(date, stats['calls'], stats['tokens'], round(stats['cost'], 4))
+         for date, stats in daily_items],
+        columns=['Date', 'Calls', 'Tokens', 'Cost ($)'],
+    ).set_index('Date')
+
+
+tracker = _tracker()
+
+
+def _usage_overview():
+    """Headline metrics, provider/operation breakdowns and the 7-day chart."""
+    tracker_mtime = os.path.getmtime(_tracker().storage_path)
+    summary = _cached_summary(tracker_mtime)
+    daily_stats = _cached_daily(tracker_mtime, 7, datetime.now().strftime('%Y-%m-%d-%H'))
+
+    # Overall Summary
+    col1, col2, col3, col4 = st.columns(4)
+
+    with col1:
+        st.metric(
+            "Total API Calls",
+            f"{summary['total_calls']:,}",
+            help="Total number of API calls made"
+        )
+
+    with col2:
+        st.metric(
+            "Total Tokens",
+            f"{summary['total_tokens']:,}",
+            help="Total tokens processed (input + output)"
+        )
+
+    with col3:
+        st.metric(
+            "Estimated Cost",
+            f"${summary['total_cost']:.4f}",
+            help="Estimated total cost in USD"
+        )
+
+    with col4:
+        st.metric(
+            "Avg Cost/Call",
+            f"${summary['avg_cost_per_call']:.4f}",
+            help="Average cost per API call"
+        )
+
+    # Breakdown by Provider
+    if summary['by_provider']:
+        st.markdown("### 🔑 Usage by Provider")
+
+        st.markdown(_CARD_ROW_HTML.format(gap='1rem', cards="".join(
+            _USAGE_PROVIDER_CARD_HTML.format(
+                color=PRIMARY if provider == 'openai' else ACCENT,
+                icon="🤖" if provider == 'openai' else "🧠",
+                provider=provider.upper(),
+                **stats
+            )
+            for provider, stats in summary['by_provider'].items()
+        )), unsafe_allow_html=True)
+
+    # Breakdown by Operation
+    if summary['by_operation']:
+        st.markdown("### ⚡ Usage by Operation")
+
+        for stats in summary['by_operation'].values():
+            col1, col2, col3, col4 = st.columns([3, 2, 2, 2])
+
+            with col1:
+                st.markdown(f"**{stats['display_name']}**")
+            with col2:
+                st.caption(f"{stats['calls']:,} calls")
+            with col3:
+                st.caption(f"{stats['tokens']:,} tokens")
+            with col4:
+                st.caption(f"${stats['cost']:.4f}")
+
+    # Daily Usage Chart
+    if daily_stats:
+        st.markdown("### 📅 Last 7 Days")
+
+        df = _daily_df(tuple(sorted(daily_stats.items())))
+        st.dataframe(df, width='stretch')
 
         # Simple chart
         st.markdown("**Cost Trend**")
-        st.bar_chart(df.set_index('Date')['Cost ($)'])
-
-    st.markdown("<br>", unsafe_allow_html=True)
-
-# Recent API Calls
-with st.expander("🔍 Recent API Calls (Last 10)", expanded=False):
-    recent = tracker.get_recent_calls(limit=10)
-
-    if recent:
-        for call in reversed(recent):  # Show newest first
-            timestamp = call['timestamp'].split('T')[1].split('.')[0] if 'T' in call['timestamp'] else call['timestamp']
-            date = call['timestamp'].split('T')[0] if 'T' in call['timestamp'] else ''
-
-            status_icon = "✅" if call['success'] else "❌"
-            cost_str = f"${call['estimated_cost']:.4f}"
-
-            st.markdown(f"""
-            <div style='background: #f8f9fa; padding: 1rem; border-radius: 8px; margin-bottom: 0.5rem; border-left: 3px solid {"#00FF00" if call["success"] else "#FF0000"};'>
-                <div style='display: flex; justify-content: space-between; align-items: center;'>
-                    <div>
-                        <strong>{status_icon} {call['operation'].replace('_', ' ').title()}</strong><br/>
-                        <span style='font-size: 0.85rem; color: #666;'>
-                            {call['provider']} • {call['model'][:30]}{'...' if len(call['model']) > 30 else ''} • {date} {timestamp}
-                        </span>
-                    </div>
-                    <div style='text-align: right;'>
-                        <strong style='color: {BRAND_COLORS["primary"]};'>{cost_str}</strong><br/>
-                        <span style='font-size: 0.85rem; color: #999;'>{call['total_tokens']:,} tokens</span>
-                    </div>
-                </div>
-            </div>
-            """, unsafe_allow_html=True)
-    else:
-        st.info("No API calls tracked yet. Usage will appear here after you use Scout or QA Validation.")
+        st.bar_chart(df['Cost ($)'])
 
-# Reset button
-st.markdown("<br>", unsafe_allow_html=True)
-col1, col2, col3 = st.columns([1, 1, 2])
 
-with col1:
-    if st.button("🔄 Refresh Stats"):
-        st.rerun()
+def _recent_calls():
+    """Expander listing the most recent tracked API calls."""
+    with st.expander("🔍 Recent API Calls (Last 10)", expanded=False):
+        recent = _cached_recent(os.path.getmtime(_tracker().storage_path), 10)
 
-with col2:
-    if st.button("🗑️ Reset All Stats"):
-        tracker.reset_stats()
-        st.success("✓ Usage statistics reset")
-        st.rerun()
+        if recent:
+            payload = json.dumps(recent, separators=(',', ':')).replace('</', '<\\/')
+            components.html(
+                _RECENT_CALLS_HTML % {'primary': PRIMARY, 'calls': payload},
+                height=min(600, 90 * len(recent)),
+                scrolling=True
+            )
+        else:
+            st.info("No API calls tracked yet. Usage will appear here after you use Scout or QA Validation.")
 
-st.markdown("<br>", unsafe_allow_html=True)
 
-# Help Section
-st.markdown("---")
-st.markdown(f"## 💡 Help & Documentation")
+@st.fragment
+def _usage_stats():
+    """
+    Usage overview, recent calls and the Refresh/Reset buttons.
+
+    Runs as a fragment so refreshing or resetting the stats reruns only this
+    section, not the API key forms above it.
+    """
+    _usage_overview()
+    _recent_calls()
+
+    # Reset button
+    col1, col2, col3 = st.columns([1, 1, 2])
 
-st.markdown(f"""
+    with col1:
+        if st.button("🔄 Refresh Stats"):
+            st.rerun(scope="fragment")
+
+    with col2:
+        if st.button("🗑️ Reset All Stats"):
+            tracker.reset_stats()
+            _cached_summary.clear()
+            _cached_daily.clear()
+            _cached_recent.clear()
+            st.success("✓ Usage statistics reset")
+            st.rerun(scope="fragment")
+
+
+_usage_stats()
+
+# Help Section
+@st.cache_data(show_spinner=False)
+def _faq_html(primary: str, secondary: str) -> str:
+    """Help & Documentation FAQ block, cached per brand colour pair."""
+    return f"""
+<hr>
+<h2>💡 Help &amp; Documentation</h2>
 <div style='background: linear-gradient(135deg, rgba(0,255,0,0.03) 0%, rgba(0,0,0,0.03) 100%);
             padding: 2rem; border-radius: 12px;'>
-    <h4 style='color: {BRAND_COLORS['secondary']};'>❓ Frequently Asked Questions</h4>
+    <h4 style='color: {secondary};'>❓ Frequently Asked Questions</h4>
 
     <details style='margin-top: 1rem;'>
-        <summary style='cursor: pointer; color: {BRAND_COLORS['primary']}; font-weight: 600; font-size: 1.05rem;'>
+        <summary style='cursor: pointer; color: {primary}; font-weight: 600; font-size: 1.05rem;'>
             Where are my API keys stored?
         </summary>
         <p style='color: #666; margin-top: 0.5rem; padding-left: 1.5rem; line-height: 1.7;'>
@@ -437,7 +719,7 @@ st.markdown(f"""
     </details>
 
     <details style='margin-top: 1rem;'>
-        <summary style='cursor: pointer; color: {BRAND_COLORS['primary']}; font-weight: 600; font-size: 1.05rem;'>
+        <summary style='cursor: pointer; color: {primary}; font-weight: 600; font-size: 1.05rem;'>
             Do I need both OpenAI and Anthropic keys?
         </summary>
         <p style='color: #666; margin-top: 0.5rem; padding-left: 1.5rem; line-height: 1.7;'>
@@ -447,7 +729,7 @@ st.markdown(f"""
     </details>
 
     <details style='margin-top: 1rem;'>
-        <summary style='cursor: pointer; color: {BRAND_COLORS['primary']}; font-weight: 600; font-size: 1.05rem;'>
+        <summary style='cursor: pointer; color: {primary}; font-weight: 600; font-size: 1.05rem;'>
             What if I don't have an API key?
         </summary>
         <p style='color: #666; margin-top: 0.5rem; padding-left: 1.5rem; line-height: 1.7;'>
@@ -457,7 +739,7 @@ st.markdown(f"""
     </details>
 
     <details style='margin-top: 1rem;'>
-        <summary style='cursor: pointer; color: {BRAND_COLORS['primary']}; font-weight: 600; font-size: 1.05rem;'>
+        <summary style='cursor: pointer; color: {primary}; font-weight: 600; font-size: 1.05rem;'>
             How do I share this with my team?
         </summary>
         <p style='color: #666; margin-top: 0.5rem; padding-left: 1.5rem; line-height: 1.7;'>
@@ -467,7 +749,7 @@ st.markdown(f"""
     </details>
 
     <details style='margin-top: 1rem;'>
-        <summary style='cursor: pointer; color: {BRAND_COLORS['primary']}; font-weight: 600; font-size: 1.05rem;'>
+        <summary style='cursor: pointer; color: {primary}; font-weight: 600; font-size: 1.05rem;'>
             Are my API keys secure?
         </summary>
         <p style='color: #666; margin-top: 0.5rem; padding-left: 1.5rem; line-height: 1.7;'>
@@ -476,26 +758,36 @@ st.markdown(f"""
         </p>
     </details>
 </div>
-""", unsafe_allow_html=True)
+"""
+
 
 # Footer
-st.markdown("---")
-st.markdown(f"""
+@st.cache_data(show_spinner=False)
+def _footer_html(primary: str, text: str) -> str:
+    """Page footer, cached per brand colour pair."""
+    return f"""
+<hr>
 <div style='text-align: center; padding: 2rem; background: linear-gradient(135deg, rgba(0,255,0,0.03) 0%, rgba(0,0,0,0.03) 100%);
             border-radius: 12px; margin-top: 2rem;'>
-    <p style='color: {BRAND_COLORS['text']}; font-size: 1rem; font-weight: 600; margin: 0.5rem 0;'>
+    <p style='color: {text}; font-size: 1rem; font-weight: 600; margin: 0.5rem 0;'>
         ⚡ <strong>Electric Glue</strong> | Settings & Configuration
     </p>
     <p style='font-size: 0.85rem; color: #999; margin: 1rem 0 0.5rem 0;'>
         Secure API Key Management
     </p>
     <p style='font-size: 0.8rem; color: #bbb; margin-top: 1.5rem; padding-top: 1rem; border-top: 1px solid #e0e0e0;'>
-        Powered by Multi-Agent AI × <strong style='color: {BRAND_COLORS['primary']};'>Front Left</strong> Thinking
+        Powered by Multi-Agent AI × <strong style='color: {primary};'>Front Left</strong> Thinking
     </p>
     <p style='font-size: 0.85rem; margin-top: 1.5rem;'>
-        <a href='https://forms.gle/mXR2nYbJWZ6WzwPX8' target='_blank' style='color: {BRAND_COLORS['primary']}; text-decoration: none; font-weight: 600;'>
+        <a href='https://forms.gle/mXR2nYbJWZ6WzwPX8' target='_blank' style='color: {primary}; text-decoration: none; font-weight: 600;'>
             💬 Share Your Feedback
         </a>
     </p>
 </div>
-""", unsafe_allow_html=True)
+"""
+
+
+st.markdown(
+    _faq_html(PRIMARY, SECONDARY) + _footer_html(PRIMARY, TEXT),
+    unsafe_allow_html=True
+)
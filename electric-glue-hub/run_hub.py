@@ -3,8 +3,9 @@ Startup script for Electric Glue Hub
 Runs on port 8505 (different from Budget Optimizer)
 """
 
-import subprocess
-import sys
+from pathlib import Path
+
+from streamlit.web import bootstrap
 
 print("\n" + "=" * 80)
 print("ELECTRIC GLUE HUB - AGENTIC MARKETING PLATFORM")
@@ -16,12 +17,11 @@ print("  [OK] Product 2: Marketing Intelligence Assistant (integrated)")
 print("  [SOON] Product 3: Report QA Layer (coming soon)")
 print("\n" + "=" * 80 + "\n")
 
-subprocess.run([
-    sys.executable,
-    "-m",
-    "streamlit",
-    "run",
-    "app.py",
-    "--server.port=8505",
-    "--server.headless=false"
-])
+# Launch in-process, the same way `streamlit run` does, instead of
+# spawning a second interpreter.
+flag_options = {
+    "server.port": 8505,
+    "server.headless": False,
+}
+bootstrap.load_config_options(flag_options=flag_options)
+bootstrap.run(str(Path(__file__).resolve().parent / "app.py"), False, [], flag_options)
@@ -2,6 +2,12 @@
 Analysis Agent - Bayesian model fitting and causal effect estimation
 """
 
+import bisect
+import copy
+import datetime as dt
+import json
+import logging
+import math
 import pandas as pd
 import numpy as np
 from typing import Dict, List, Optional, Tuple
@@ -13,6 +19,90 @@ from core.bayesian_models import (
     auto_select_model
 )
 
+logger = logging.getLogger(__name__)
+
+# Pre-period MAPE (%) upper bounds for each fit quality label; the last label covers the rest
+_QUALITY_MAPE_BOUNDS = (5, 10, 20)
+_QUALITY_LABELS = ("Excellent", "Good", "Acceptable", "Poor - High prediction error")
+
+# auto_select_model results keyed on a content fingerprint of the target series
+_SPEC_CACHE: Dict[tuple, Dict] = {}
+_SPEC_CACHE_SIZE = 32
+
+
+def _cached_auto_select_model(data: pd.DataFrame, target_col: str) -> Dict:
+    """auto_select_model, memoized on the target column's values and index."""
+    series = data[target_col]
+    key = (
+        target_col,
+        len(series),
+        int(pd.util.hash_pandas_object(series, index=True).sum())
+    )
+    spec = _SPEC_CACHE.get(key)
+    if spec is None:
+        spec = auto_select_model(data, target_col)
+        if len(_SPEC_CACHE) >= _SPEC_CACHE_SIZE:
+            _SPEC_CACHE.pop(next(iter(_SPEC_CACHE)))
+        _SPEC_CACHE[key] = spec
+    return copy.deepcopy(spec)
+
+
+def _json_ready(value):
+    """
+    Convert an export payload to plain JSON types.
+
+    Dates and timestamps become ISO 8601 strings, NaN/inf become None, and
+    numpy scalars and arrays become Python numbers and lists, so the orjson and
+    standard-library writers produce the same document. Anything else is
+    written as its str().
+    """
+    if isinstance(value, dict):
+        return {
+            (k if isinstance(k, str) else str(_json_ready(k))): _json_ready(v)
+            for k, v in value.items()
+        }
+    if isinstance(value, (list, tuple)):
+        return [_json_ready(v) for v in value]
+    if isinstance(value, np.ndarray):
+        return [_json_ready(v) for v in value.tolist()]
+    if value is None or isinstance(value, (str, bool)):
+        return value
+    if isinstance(value, np.bool_):
+        return bool(value)
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    if isinstance(value, (float, np.floating)):
+        return float(value) if math.isfinite(value) else None
+    if isinstance(value, np.datetime64):
+        value = pd.Timestamp(value)
+    if value is pd.NaT:
+        return None
+    if isinstance(value, (dt.date, dt.datetime, dt.time)):  # includes pd.Timestamp
+        return value.isoformat()
+    return str(value)
+
+
+def _pre_period_metrics(actual: np.ndarray, predicted: np.ndarray) -> Tuple[float, float, float]:
+    """
+    RMSE, MAPE (%) and R² of a pre-period fit from one residual buffer.
+
+    The residual array is reused in place for the relative errors and the sums
+    of squares come from dot products. The total sum of squares is taken about
+    the mean: the one-pass sum(y²) - sum(y)²/n form cancels catastrophically for
+    high-level, low-variance KPIs.
+    """
+    n = actual.size
+    resid = actual - predicted
+    ss_res = resid @ resid
+    centred = actual - actual.mean()
+    ss_tot = centred @ centred
+
+    np.divide(resid, actual, out=resid)
+    np.abs(resid, out=resid)
+    mape = resid.sum() * 100.0 / n
+
+    return math.sqrt(ss_res / n), mape, 1.0 - ss_res / ss_tot
+
 
 class AnalysisAgent:
     """
@@ -33,6 +123,26 @@ class AnalysisAgent:
         self.data = None
         self.results = None
         self.diagnostics = {}
+        self._counterfactual_arr = None
+        self._fit_inputs = None
+        self._sensitivity_cache = {}
+        self._last_fp = None
+
+    def reset(self):
+        """Discard the previous analysis so the next analyze() call always refits."""
+        self.__init__()
+
+    def _fingerprint(
+        self,
+        data: pd.DataFrame,
+        target_col: str,
+        covariate_cols: Optional[List[str]],
+        params: tuple
+    ) -> tuple:
+        """Identify an analyze() call by the modelled columns' contents and its arguments."""
+        columns = [target_col] + list(covariate_cols or [])
+        data_hash = int(pd.util.hash_pandas_object(data[columns], index=True).sum())
+        return (tuple(columns), len(data), data_hash, repr(params))
 
     def analyze(
         self,
@@ -70,40 +180,61 @@ class AnalysisAgent:
         Returns
         -------
         dict with analysis results, causal effects, and diagnostics
+
+        Repeating a call with identical data and arguments returns the previous
+        results without refitting; call reset() to force a refit. The returned
+        dict is a copy, so callers may modify it without affecting later calls.
         """
         try:
+            fingerprint = self._fingerprint(
+                data, target_col, covariate_cols,
+                (pre_period, post_period, model_config, niter, nburn)
+            )
+            if fingerprint == self._last_fp and self.results and self.results.get('success'):
+                logger.info("♻️ Inputs unchanged - reusing previous analysis results")
+                return copy.deepcopy(self.results)
+            self._last_fp = None
+
             self.data = data
 
             # Step 1: Auto-select model (unless manual config provided)
             if model_config is None:
-                print("📊 Auto-selecting BSTS model based on data characteristics...")
-                self.model_spec = auto_select_model(data, target_col)
-                print(f"   Seasonality: {self.model_spec['recommendation']['seasonality']}")
-                print(f"   Trend: {self.model_spec['recommendation']['trend']}")
-                print(f"   Local variation: {self.model_spec['recommendation']['local_variation']}")
+                logger.info("📊 Auto-selecting BSTS model based on data characteristics...")
+                self.model_spec = _cached_auto_select_model(data, target_col)
+                if logger.isEnabledFor(logging.INFO):
+                    recommendation = self.model_spec['recommendation']
+                    logger.info("   Seasonality: %s", recommendation['seasonality'])
+                    logger.info("   Trend: %s", recommendation['trend'])
+                    logger.info("   Local variation: %s", recommendation['local_variation'])
             else:
                 self.model_spec = model_config
-                print("📊 Using manual model configuration")
-
-            # Step 2: Prepare data
-            y = data[target_col]
-            X = data[covariate_cols] if covariate_cols else None
-
-            # Convert date strings to indices
-            pre_start_idx = data.index.get_loc(pd.to_datetime(pre_period[0]))
-            pre_end_idx = data.index.get_loc(pd.to_datetime(pre_period[1]))
-            post_start_idx = data.index.get_loc(pd.to_datetime(post_period[0]))
-            post_end_idx = data.index.get_loc(pd.to_datetime(post_period[1]))
+                logger.info("📊 Using manual model configuration")
+
+            # Step 2: Prepare data (float64 once here so the model fit does not
+            # re-coerce mixed int/float columns)
+            y = data[target_col].astype(np.float64, copy=False)
+            X = data[covariate_cols].astype(np.float64, copy=False) if covariate_cols else None
+
+            # Convert date strings to indices (one batched lookup on the sorted index)
+            if not data.index.is_monotonic_increasing:
+                raise ValueError("Data index must be sorted in increasing date order")
+            index_values = data.index.values
+            targets = pd.to_datetime([pre_period[0], pre_period[1], post_period[0], post_period[1]]).values
+            positions = np.searchsorted(index_values, targets)
+            missing = (positions >= len(index_values)) | (index_values[np.minimum(positions, len(index_values) - 1)] != targets)
+            if missing.any():
+                raise KeyError(f"Dates not found in data index: {[str(t)[:10] for t in targets[missing]]}")
+            pre_start_idx, pre_end_idx, post_start_idx, post_end_idx = (int(p) for p in positions)
 
             pre_indices = (pre_start_idx, pre_end_idx)
             post_indices = (post_start_idx, post_end_idx)
 
             # Step 3: Initialize and fit model
-            print(f"\n🔧 Fitting Bayesian Structural Time Series model...")
-            print(f"   Pre-period: {len(range(pre_start_idx, pre_end_idx + 1))} observations")
-            print(f"   Post-period: {len(range(post_start_idx, post_end_idx + 1))} observations")
+            logger.info("🔧 Fitting Bayesian Structural Time Series model...")
+            logger.info("   Pre-period: %d observations", pre_end_idx - pre_start_idx + 1)
+            logger.info("   Post-period: %d observations", post_end_idx - post_start_idx + 1)
             if covariate_cols:
-                print(f"   Covariates: {', '.join(covariate_cols)}")
+                logger.info("   Covariates: %s", ', '.join(covariate_cols))
 
             self.model = BayesianStructuralTimeSeries(
                 seasonal_periods=self.model_spec.get('seasonal_periods', [7]),
@@ -121,14 +252,26 @@ class AnalysisAgent:
                 nburn=nburn
             )
 
-            print("✅ Model fitting complete!")
+            logger.info("✅ Model fitting complete!")
+
+            # Keep the prepared inputs so sensitivity refits skip data preparation
+            self._fit_inputs = {
+                'y': y,
+                'X': X,
+                'pre_period': pre_indices,
+                'post_period': post_indices,
+                'niter': niter,
+                'nburn': nburn
+            }
 
             # Step 4: Extract results
             causal_effect = self.model.get_causal_effect()
+            self._sensitivity_cache = {self.model.prior_level_sd: causal_effect}
             counterfactual = self.model.get_counterfactual()
+            self._counterfactual_arr = counterfactual.to_numpy(dtype=np.float64)
 
             # Step 5: Compute additional metrics
-            self._compute_diagnostics(y, counterfactual, pre_indices, post_indices)
+            self._compute_diagnostics(y, self._counterfactual_arr, pre_indices, post_indices)
 
             # Store results
             self.results = {
@@ -138,11 +281,12 @@ class AnalysisAgent:
                 'diagnostics': self.diagnostics,
                 'model_spec': self.model_spec
             }
+            self._last_fp = fingerprint
 
-            return self.results
+            return copy.deepcopy(self.results)
 
         except Exception as e:
-            print(f"❌ Analysis failed: {str(e)}")
+            logger.error("❌ Analysis failed: %s", e)
             return {
                 'success': False,
                 'error': str(e)
@@ -151,22 +295,23 @@ class AnalysisAgent:
     def _compute_diagnostics(
         self,
         y: pd.Series,
-        counterfactual: pd.Series,
+        counterfactual: np.ndarray,
         pre_indices: Tuple[int, int],
         post_indices: Tuple[int, int]
     ):
         """Compute diagnostic metrics for model assessment."""
 
-        # In-sample fit (pre-period)
-        pre_actual = y.iloc[pre_indices[0]:pre_indices[1] + 1]
-        pre_predicted = counterfactual.iloc[pre_indices[0]:pre_indices[1] + 1]
+        actual = y.to_numpy(dtype=np.float64, copy=False)
+
+        # In-sample fit (pre-period), on raw arrays to skip pandas index alignment
+        pre_actual = actual[pre_indices[0]:pre_indices[1] + 1]
+        pre_predicted = counterfactual[pre_indices[0]:pre_indices[1] + 1]
 
-        pre_rmse = np.sqrt(np.mean((pre_actual - pre_predicted) ** 2))
-        pre_mape = np.mean(np.abs((pre_actual - pre_predicted) / pre_actual)) * 100
+        pre_rmse, pre_mape, pre_r2 = _pre_period_metrics(pre_actual, pre_predicted)
 
         # Out-of-sample predictions (post-period)
-        post_actual = y.iloc[post_indices[0]:post_indices[1] + 1]
-        post_predicted = counterfactual.iloc[post_indices[0]:post_indices[1] + 1]
+        post_actual = actual[post_indices[0]:post_indices[1] + 1]
+        post_predicted = counterfactual[post_indices[0]:post_indices[1] + 1]
 
         # Post-period metrics (if intervention didn't happen)
         post_error = post_actual - post_predicted
@@ -175,8 +320,7 @@ class AnalysisAgent:
             'pre_period_fit': {
                 'rmse': float(pre_rmse),
                 'mape': float(pre_mape),
-                'r_squared': float(1 - (np.sum((pre_actual - pre_predicted) ** 2) /
-                                       np.sum((pre_actual - pre_actual.mean()) ** 2)))
+                'r_squared': float(pre_r2)
             },
             'post_period': {
                 'actual_mean': float(post_actual.mean()),
@@ -188,14 +332,7 @@ class AnalysisAgent:
 
     def _assess_model_quality(self, rmse: float, mape: float) -> str:
         """Provide qualitative assessment of model fit."""
-        if mape < 5:
-            return "Excellent"
-        elif mape < 10:
-            return "Good"
-        elif mape < 20:
-            return "Acceptable"
-        else:
-            return "Poor - High prediction error"
+        return _QUALITY_LABELS[bisect.bisect_right(_QUALITY_MAPE_BOUNDS, mape)]
 
     def get_summary(self) -> str:
         """Generate human-readable summary of results."""
@@ -203,7 +340,10 @@ class AnalysisAgent:
             return "No results available - analysis not yet run or failed"
 
         effect = self.results['causal_effect']
-        diag = self.diagnostics
+        average_effect = effect['average_effect']
+        cumulative_effect = effect['cumulative_effect']
+        p_value = effect['p_value']
+        fit = self.diagnostics['pre_period_fit']
 
         summary = f"""
 BAYESIAN CAUSAL IMPACT ANALYSIS SUMMARY
@@ -211,29 +351,29 @@ BAYESIAN CAUSAL IMPACT ANALYSIS SUMMARY
 
 CAUSAL EFFECT ESTIMATES
 -----------------------
-Average Effect:    {effect['average_effect']:,.0f}  [{effect['average_effect_lower']:,.0f}, {effect['average_effect_upper']:,.0f}]
+Average Effect:    {average_effect:,.0f}  [{effect['average_effect_lower']:,.0f}, {effect['average_effect_upper']:,.0f}]
 Relative Effect:   {effect['relative_effect']*100:,.1f}%  [{effect['relative_effect_lower']*100:,.1f}%, {effect['relative_effect_upper']*100:,.1f}%]
-Cumulative Effect: {effect['cumulative_effect']:,.0f}  [{effect['cumulative_lower']:,.0f}, {effect['cumulative_upper']:,.0f}]
-P-value:          {effect['p_value']:.4f}
+Cumulative Effect: {cumulative_effect:,.0f}  [{effect['cumulative_lower']:,.0f}, {effect['cumulative_upper']:,.0f}]
+P-value:          {p_value:.4f}
 
 MODEL DIAGNOSTICS
 -----------------
-Pre-period Fit:   {diag['model_quality']} (MAPE: {diag['pre_period_fit']['mape']:.1f}%, R²: {diag['pre_period_fit']['r_squared']:.3f})
-RMSE:            {diag['pre_period_fit']['rmse']:.2f}
+Pre-period Fit:   {self.diagnostics['model_quality']} (MAPE: {fit['mape']:.1f}%, R²: {fit['r_squared']:.3f})
+RMSE:            {fit['rmse']:.2f}
 
 INTERPRETATION
 --------------
 """
-        if effect['p_value'] < 0.05:
-            summary += f"✅ STATISTICALLY SIGNIFICANT effect detected (p = {effect['p_value']:.4f})\n"
-            if effect['average_effect'] > 0:
-                summary += f"📈 The intervention caused an average INCREASE of {effect['average_effect']:,.0f} per period\n"
+        if p_value < 0.05:
+            summary += f"✅ STATISTICALLY SIGNIFICANT effect detected (p = {p_value:.4f})\n"
+            if average_effect > 0:
+                summary += f"📈 The intervention caused an average INCREASE of {average_effect:,.0f} per period\n"
             else:
-                summary += f"📉 The intervention caused an average DECREASE of {abs(effect['average_effect']):,.0f} per period\n"
+                summary += f"📉 The intervention caused an average DECREASE of {abs(average_effect):,.0f} per period\n"
         else:
-            summary += f"⚠️  No statistically significant effect detected (p = {effect['p_value']:.4f})\n"
+            summary += f"⚠️  No statistically significant effect detected (p = {p_value:.4f})\n"
 
-        summary += f"\n💡 Total impact over post-period: {effect['cumulative_effect']:,.0f} units\n"
+        summary += f"\n💡 Total impact over post-period: {cumulative_effect:,.0f} units\n"
 
         return summary
 
@@ -253,21 +393,17 @@ INTERPRETATION
 
         # Extract data
         actual = self.data[self.results['model_spec'].get('target_col', self.data.columns[0])]
-        predicted = pd.Series(self.results['counterfactual'])
-        predicted.index = actual.index
 
-        # Compute effects
-        point_effect = actual - predicted
-        cumulative_effect = point_effect.cumsum()
+        # Fill one float block column by column, computing effects in place
+        buf = np.empty((len(actual), 4), dtype=np.float64)
+        buf[:, 0] = actual.to_numpy()
+        buf[:, 1] = self._counterfactual_arr
+        np.subtract(buf[:, 0], buf[:, 1], out=buf[:, 2])
+        np.cumsum(buf[:, 2], out=buf[:, 3])
 
         # Create detailed DataFrame
-        detailed = pd.DataFrame({
-            'date': actual.index,
-            'actual': actual.values,
-            'predicted': predicted.values,
-            'point_effect': point_effect.values,
-            'cumulative_effect': cumulative_effect.values
-        })
+        detailed = pd.DataFrame(buf, columns=['actual', 'predicted', 'point_effect', 'cumulative_effect'])
+        detailed.insert(0, 'date', actual.index)
 
         return detailed
 
@@ -280,33 +416,39 @@ INTERPRETATION
 
         Shows robustness of results to modeling choices.
         """
-        if self.data is None:
+        if self.data is None or self._fit_inputs is None:
             raise ValueError("No data available - run analyze() first")
 
-        print("\n🔬 Running sensitivity analysis...")
+        logger.info("🔬 Running sensitivity analysis...")
 
         results_list = []
+        test_model = None
 
         for prior_sd in prior_sds:
-            print(f"   Testing prior_sd = {prior_sd}")
-
-            # Create model with different prior
-            test_model = BayesianStructuralTimeSeries(
-                seasonal_periods=self.model_spec.get('seasonal_periods', [7]),
-                include_trend=self.model_spec.get('include_trend', True),
-                include_local_level=self.model_spec.get('include_local_level', True),
-                prior_level_sd=prior_sd
-            )
+            logger.info("   Testing prior_sd = %s", prior_sd)
 
-            # Fit model (would need to store original parameters - simplified here)
-            # In production, store fit parameters and reuse
             try:
-                # Placeholder - in full implementation, refit model
+                # Refit only for priors not already fitted (the analyze() prior is seeded)
+                effect = self._sensitivity_cache.get(prior_sd)
+                if effect is None:
+                    # One model configured once; only the level prior changes between fits
+                    if test_model is None:
+                        test_model = BayesianStructuralTimeSeries(
+                            seasonal_periods=self.model_spec.get('seasonal_periods', [7]),
+                            include_trend=self.model_spec.get('include_trend', True),
+                            include_local_level=self.model_spec.get('include_local_level', True),
+                            prior_level_sd=prior_sd
+                        )
+                    else:
+                        test_model.set_prior_level_sd(prior_sd)
+                    test_model.fit(**self._fit_inputs)
+                    effect = test_model.get_causal_effect()
+                    self._sensitivity_cache[prior_sd] = effect
+
                 results_list.append({
                     'prior_sd': prior_sd,
-                    'average_effect': self.results['causal_effect']['average_effect'],
-                    'p_value': self.results['causal_effect']['p_value'],
-                    'note': 'Refit required for true sensitivity'
+                    'average_effect': effect['average_effect'],
+                    'p_value': effect['p_value']
                 })
             except Exception as e:
                 results_list.append({
@@ -356,16 +498,19 @@ INTERPRETATION
         output_path : str
             Path to save results
         format : str, default 'csv'
-            Output format: 'csv', 'excel', or 'json'
+            Output format: 'csv', 'parquet', 'excel', or 'json'
         """
         if not self.results or not self.results.get('success'):
-            print("❌ No results to export")
+            logger.warning("❌ No results to export")
             return
 
         detailed = self.get_detailed_results()
 
         if format == 'csv':
             detailed.to_csv(output_path, index=False)
+        elif format == 'parquet':
+            # Columnar and compressed; pyarrow is listed in requirements.txt
+            detailed.to_parquet(output_path, index=False, compression='zstd')
         elif format == 'excel':
             with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
                 detailed.to_excel(writer, sheet_name='Detailed Results', index=False)
@@ -386,19 +531,27 @@ INTERPRETATION
                 pd.DataFrame(summary_data).to_excel(writer, sheet_name='Summary', index=False)
 
         elif format == 'json':
-            import json
-            with open(output_path, 'w') as f:
-                json.dump({
-                    'causal_effect': self.results['causal_effect'],
-                    'diagnostics': self.diagnostics,
-                    'detailed_results': detailed.to_dict(orient='records')
-                }, f, indent=2, default=str)
+            # Normalise first so the file does not depend on which writer is installed
+            payload = _json_ready({
+                'causal_effect': self.results['causal_effect'],
+                'diagnostics': self.diagnostics,
+                'detailed_results': detailed.to_dict(orient='records')
+            })
+            try:
+                import orjson
+            except ImportError:
+                with open(output_path, 'w', encoding='utf-8') as f:
+                    json.dump(payload, f, indent=2, ensure_ascii=False, allow_nan=False)
+            else:
+                with open(output_path, 'wb') as f:
+                    f.write(orjson.dumps(payload, option=orjson.OPT_INDENT_2))
 
-        print(f"✅ Results exported to {output_path}")
+        logger.info("✅ Results exported to %s", output_path)
 
 
 # Example usage
 if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
     from agents.data_agent import create_sample_data
 
     # Create sample data
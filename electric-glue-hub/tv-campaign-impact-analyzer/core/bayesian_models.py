@@ -109,6 +109,17 @@ class BayesianStructuralTimeSeries:
 
         return self
 
+    def set_prior_level_sd(self, prior_level_sd: float):
+        """
+        Change the level prior in place for a subsequent fit().
+
+        Lets sensitivity analysis reuse one configured model across priors
+        instead of constructing a new one per value.
+        """
+        self.prior_level_sd = prior_level_sd
+        self.model = None
+        return self
+
     def summary(self) -> pd.DataFrame:
         """Get summary statistics from fitted model."""
         if self.model is None:
@@ -5,9 +5,19 @@ Defines ValidationResult, ValidationIssue, and related models used by
 the QA Housekeeping Agent to validate outputs before showing to users.
 """
 
+import json
+import sys
+from collections import Counter
 from dataclasses import dataclass, field
+from operator import attrgetter
 from typing import List, Dict, Optional
-from enum import Enum
+from enum import Enum, IntEnum
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 
 class ValidationDecision(Enum):
@@ -17,12 +27,12 @@ class ValidationDecision(Enum):
     WARN = "WARN"        # Minor issues found, show with warnings
 
 
-class IssueSeverity(Enum):
-    """Severity levels for validation issues."""
-    CRITICAL = "CRITICAL"  # Blocks output (fabrication, invalid citations)
-    HIGH = "HIGH"          # Serious concern (missing citations, contradictions)
-    MEDIUM = "MEDIUM"      # Notable issue (incomplete sections, weak evidence)
-    LOW = "LOW"            # Minor quality issue (style, formatting)
+class IssueSeverity(IntEnum):
+    """Severity levels for validation issues (higher is worse; serialised by name)."""
+    CRITICAL = 4  # Blocks output (fabrication, invalid citations)
+    HIGH = 3      # Serious concern (missing citations, contradictions)
+    MEDIUM = 2    # Notable issue (incomplete sections, weak evidence)
+    LOW = 1       # Minor quality issue (style, formatting)
 
 
 class IssueType(Enum):
@@ -39,7 +49,24 @@ class IssueType(Enum):
     LOGICAL_INCONSISTENCY = "LOGICAL_INCONSISTENCY"  # Logic doesn't follow
 
 
-@dataclass
+# Summary headline per decision
+_DECISION_HEADLINES = {
+    ValidationDecision.BLOCK: '🚫 BLOCKED',
+    ValidationDecision.WARN: '⚠️ APPROVED WITH WARNINGS',
+    ValidationDecision.APPROVE: '✅ APPROVED'
+}
+
+# Slotted dataclasses drop the per-instance __dict__ (dataclass(slots=...) needs Python 3.10+)
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+# Serialised issue keys and the attribute paths they are read from
+_ISSUE_KEYS = ('severity', 'type', 'description', 'location', 'evidence', 'recommendation')
+_issue_fields = attrgetter(
+    'severity.name', 'issue_type.value', 'description', 'location', 'evidence', 'recommendation'
+)
+
+
+@dataclass(**_SLOTS)
 class ValidationIssue:
     """A single validation issue found in output."""
 
@@ -52,7 +79,7 @@ class ValidationIssue:
 
     def __str__(self) -> str:
         """Human-readable issue description."""
-        parts = [f"[{self.severity.value}] {self.issue_type.value}: {self.description}"]
+        parts = [f"[{self.severity.name}] {self.issue_type.value}: {self.description}"]
         if self.location:
             parts.append(f"  Location: {self.location}")
         if self.evidence:
@@ -64,7 +91,7 @@ class ValidationIssue:
         return "\n".join(parts)
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class ValidationResult:
     """Result of QA validation."""
 
@@ -77,12 +104,18 @@ class ValidationResult:
 
     def __post_init__(self):
         """Calculate severity counts after initialization."""
-        self.severity_counts = {
-            'CRITICAL': sum(1 for issue in self.issues if issue.severity == IssueSeverity.CRITICAL),
-            'HIGH': sum(1 for issue in self.issues if issue.severity == IssueSeverity.HIGH),
-            'MEDIUM': sum(1 for issue in self.issues if issue.severity == IssueSeverity.MEDIUM),
-            'LOW': sum(1 for issue in self.issues if issue.severity == IssueSeverity.LOW)
-        }
+        counts = Counter(issue.severity for issue in self.issues)
+        self.severity_counts = {severity.name: counts[severity] for severity in IssueSeverity}
+
+    @property
+    def critical_count(self) -> int:
+        """Number of CRITICAL issues currently in ``issues``."""
+        return sum(1 for issue in self.issues if issue.severity is IssueSeverity.CRITICAL)
+
+    @property
+    def high_count(self) -> int:
+        """Number of HIGH issues currently in ``issues``."""
+        return sum(1 for issue in self.issues if issue.severity is IssueSeverity.HIGH)
 
     def should_block(self) -> bool:
         """Determine if output should be blocked based on issues."""
@@ -94,11 +127,11 @@ class ValidationResult:
 
     def get_critical_issues(self) -> List[ValidationIssue]:
         """Get all CRITICAL severity issues."""
-        return [issue for issue in self.issues if issue.severity == IssueSeverity.CRITICAL]
+        return [issue for issue in self.issues if issue.severity is IssueSeverity.CRITICAL]
 
     def get_high_issues(self) -> List[ValidationIssue]:
         """Get all HIGH severity issues."""
-        return [issue for issue in self.issues if issue.severity == IssueSeverity.HIGH]
+        return [issue for issue in self.issues if issue.severity is IssueSeverity.HIGH]
 
     def summary(self) -> str:
         """Get human-readable validation summary."""
@@ -106,44 +139,55 @@ class ValidationResult:
             return "✅ Validation PASSED - No issues found"
 
         summary_lines = [
-            f"{'🚫 BLOCKED' if self.decision == ValidationDecision.BLOCK else '⚠️ APPROVED WITH WARNINGS' if self.decision == ValidationDecision.WARN else '✅ APPROVED'}",
+            _DECISION_HEADLINES[self.decision],
             f"Total issues: {len(self.issues)}",
-            f"  CRITICAL: {self.severity_counts.get('CRITICAL', 0)}",
-            f"  HIGH: {self.severity_counts.get('HIGH', 0)}",
-            f"  MEDIUM: {self.severity_counts.get('MEDIUM', 0)}",
-            f"  LOW: {self.severity_counts.get('LOW', 0)}"
+            *(f"  {name}: {count}" for name, count in self.severity_counts.items())
         ]
 
-        if self.decision == ValidationDecision.BLOCK and self.get_critical_issues():
+        critical = self.get_critical_issues()
+        if self.decision == ValidationDecision.BLOCK and critical:
             summary_lines.append("\nCritical issues (must fix):")
-            for issue in self.get_critical_issues()[:3]:  # Show first 3
-                summary_lines.append(f"  - {issue.description}")
+            summary_lines.extend(f"  - {issue.description}" for issue in critical[:3])  # Show first 3
 
         return "\n".join(summary_lines)
 
-    def to_dict(self) -> Dict:
-        """Convert to dictionary for JSON serialization."""
-        return {
-            'decision': self.decision.value,
-            'issues': [
-                {
-                    'severity': issue.severity.value,
-                    'type': issue.issue_type.value,
-                    'description': issue.description,
-                    'location': issue.location,
-                    'evidence': issue.evidence,
-                    'recommendation': issue.recommendation
-                }
+    def to_dict(self, omit_none: bool = False) -> Dict:
+        """
+        Convert to dictionary for JSON serialization.
+
+        With ``omit_none=True``, unset optional fields (issue location,
+        evidence, recommendation and the validation timestamp) are left out
+        instead of being emitted as null.
+        """
+        if omit_none:
+            issues = [
+                {key: value for key, value in zip(_ISSUE_KEYS, _issue_fields(issue)) if value is not None}
                 for issue in self.issues
-            ],
+            ]
+        else:
+            issues = [dict(zip(_ISSUE_KEYS, _issue_fields(issue))) for issue in self.issues]
+
+        result = {
+            'decision': self.decision.value,
+            'issues': issues,
             'severity_counts': self.severity_counts,
             'fix_recommendations': self.fix_recommendations,
             'validation_timestamp': self.validation_timestamp,
             'validator_version': self.validator_version
         }
+        if omit_none and self.validation_timestamp is None:
+            del result['validation_timestamp']
+        return result
+
+    def to_json(self) -> bytes:
+        """Serialize to UTF-8 JSON bytes, omitting unset fields (uses orjson when installed)."""
+        payload = self.to_dict(omit_none=True)
+        if ORJSON_AVAILABLE:
+            return orjson.dumps(payload)
+        return json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class QAConfig:
     """Configuration for QA validation."""
 
@@ -176,10 +220,10 @@ class QAConfig:
         if not self.enabled:
             return False
 
-        if self.block_on_critical and validation_result.severity_counts.get('CRITICAL', 0) > 0:
+        if self.block_on_critical and validation_result.critical_count > 0:
             return True
 
-        if validation_result.severity_counts.get('HIGH', 0) >= self.block_on_high_count:
+        if validation_result.high_count >= self.block_on_high_count:
             return True
 
         return False
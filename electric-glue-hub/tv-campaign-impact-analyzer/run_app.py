@@ -2,13 +2,17 @@
 Startup script for TV Campaign Impact Analyzer
 """
 
-import subprocess
-import sys
+import os
 from pathlib import Path
 
-# Generate sample data if it doesn't exist
+from streamlit.web import bootstrap
+
+# Generate sample data if it doesn't exist (the data agent is only
+# imported when the file actually has to be created)
 sample_data_path = Path('sample_data/nielsen_tv_sample.csv')
-if not sample_data_path.exists():
+try:
+    os.stat(sample_data_path)
+except FileNotFoundError:
     print("📊 Generating sample data...")
     from agents.data_agent import create_sample_data
 
@@ -21,12 +25,11 @@ if not sample_data_path.exists():
 print("\n🚀 Starting TV Campaign Impact Analyzer...")
 print("🌐 Opening browser at http://localhost:8501\n")
 
-subprocess.run([
-    sys.executable,
-    "-m",
-    "streamlit",
-    "run",
-    "streamlit_app/app.py",
-    "--server.port=8501",
-    "--server.headless=false"
-])
+# Launch in-process, the same way `streamlit run` does, instead of
+# spawning a second interpreter.
+flag_options = {
+    "server.port": 8501,
+    "server.headless": False,
+}
+bootstrap.load_config_options(flag_options=flag_options)
+bootstrap.run(str(Path(__file__).resolve().parent / "streamlit_app" / "app.py"), False, [], flag_options)
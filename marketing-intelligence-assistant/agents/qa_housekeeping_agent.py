@@ -376,7 +376,7 @@ class QAHousekeepingAgent:
                 'severity_counts': result.severity_counts,
                 'issues': [
                     {
-                        'severity': issue.severity.value,
+                        'severity': issue.severity.name,
                         'type': issue.issue_type.value,
                         'description': issue.description,
                         'location': issue.location
@@ -35,7 +35,7 @@ class DataAgent:
         Parameters
         ----------
         file_path : str
-            Path to CSV or Excel file
+            Path to CSV, Excel or Parquet file
 
         Returns
         -------
@@ -47,6 +47,9 @@ class DataAgent:
                 self.raw_data = pd.read_csv(file_path)
             elif file_path.endswith(('.xlsx', '.xls')):
                 self.raw_data = pd.read_excel(file_path)
+            elif file_path.endswith('.parquet'):
+                # Parquet engine (pyarrow) is listed in requirements.txt
+                self.raw_data = pd.read_parquet(file_path)
             else:
                 return {
                     'success': False,
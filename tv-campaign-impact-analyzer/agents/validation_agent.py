@@ -2,15 +2,123 @@
 Validation Agent - Data quality checks and confounder detection
 """
 
+import copy
+import functools
+import importlib
 import pandas as pd
 import numpy as np
 from typing import Dict, List, Optional, Tuple
-from scipy import stats
-from statsmodels.stats.diagnostic import het_white, acorr_ljungbox
-from statsmodels.tsa.stattools import adfuller, kpss
 import warnings
 warnings.filterwarnings('ignore')
 
+# Checks that feed the overall score and their weights
+_CHECK_NAMES = (
+    'completeness',
+    'stationarity',
+    'outliers',
+    'heteroscedasticity',
+    'autocorrelation',
+    'structural_break',  # High weight - critical!
+    'confounders',
+    'multicollinearity'
+)
+_CHECK_WEIGHTS = np.array([0.25, 0.15, 0.15, 0.10, 0.10, 0.20, 0.15, 0.10])
+
+
+@functools.lru_cache(maxsize=None)
+def _lazy(module_name: str):
+    """
+    Import ``module_name`` on first use and memoize it.
+
+    scipy.stats and statsmodels are slow to import; deferring them keeps
+    ``import agents`` cheap for callers that never run validation.
+    """
+    return importlib.import_module(module_name)
+
+
+def _intervention_position(index: pd.Index, intervention_date) -> int:
+    """
+    Position of ``intervention_date`` in a date index, by binary search.
+
+    Raises ValueError if the index is not sorted (the search would silently
+    mis-split pre/post) and KeyError if the date is not in the index.
+    """
+    if not index.is_monotonic_increasing:
+        raise ValueError("Data index must be sorted in increasing date order")
+    values = index.values
+    target = pd.Timestamp(intervention_date).to_datetime64()
+    position = int(np.searchsorted(values, target))
+    if position >= len(values) or values[position] != target:
+        raise KeyError(f"Intervention date not found in data index: {str(target)[:10]}")
+    return position
+
+
+def _time_slope(values: np.ndarray) -> float:
+    """OLS slope of ``values`` on 0..n-1, in closed form."""
+    t_centered = np.arange(values.size, dtype=np.float64)
+    t_centered -= t_centered.mean()
+    return float(t_centered @ (values - values.mean()) / (t_centered @ t_centered))
+
+
+def _quartiles(values: np.ndarray) -> Tuple[float, float]:
+    """
+    First and third quartiles of ``values`` (linear interpolation, as np.quantile).
+
+    Large arrays are partitioned around the four neighbouring order statistics
+    instead of being sorted; small ones go straight to np.quantile.
+    """
+    n = values.size
+    if n < 1024:
+        q1, q3 = np.quantile(values, [0.25, 0.75])
+        return float(q1), float(q3)
+
+    h1, h3 = (n - 1) * 0.25, (n - 1) * 0.75
+    i1, i3 = int(h1), int(h3)
+    part = np.partition(values, [i1, i1 + 1, i3, i3 + 1])
+    q1 = part[i1] + (h1 - i1) * (part[i1 + 1] - part[i1])
+    q3 = part[i3] + (h3 - i3) * (part[i3 + 1] - part[i3])
+    return float(q1), float(q3)
+
+
+def _cusum_stats(values: np.ndarray, mean: float, std: float, split: int) -> Tuple[float, float, Optional[float]]:
+    """
+    Summarise the standardised CUSUM of ``values`` around position ``split``.
+
+    Returns (range of the CUSUM before ``split``, last value before ``split``,
+    first value from ``split`` on or None if there is none). The CUSUM is built
+    in a single buffer and never copied.
+    """
+    cusum = values - mean
+    cusum /= std
+    np.cumsum(cusum, out=cusum)
+    cusum_pre = cusum[:split]
+    first_post = float(cusum[split]) if split < cusum.size else None
+    return float(cusum_pre.max() - cusum_pre.min()), float(cusum_pre[-1]), first_post
+
+
+def _ljung_box_pvalues(values: np.ndarray, lags: List[int]) -> Dict[int, float]:
+    """
+    Ljung-Box p-values at each of ``lags``, from a single FFT autocorrelation.
+
+    Same statistic as statsmodels' acorr_ljungbox: Q(h) = n(n+2) * sum_k rho_k^2 / (n-k).
+    """
+    if not lags:
+        return {}
+
+    n = values.size
+    max_lag = max(lags)
+    x = values - values.mean()
+
+    # Autocovariance via FFT, zero-padded to avoid circular wrap-around
+    nfft = 1 << (2 * n - 1).bit_length()
+    spectrum = np.fft.rfft(x, nfft)
+    acov = np.fft.irfft(spectrum * np.conj(spectrum), nfft)[:max_lag + 1]
+    rho = acov[1:] / acov[0]
+
+    q = n * (n + 2) * np.cumsum(rho ** 2 / (n - np.arange(1, max_lag + 1)))
+    lag_arr = np.asarray(lags)
+    return dict(zip(lags, _lazy('scipy.stats').chi2.sf(q[lag_arr - 1], df=lag_arr).tolist()))
+
 
 class ValidationAgent:
     """
@@ -24,13 +132,29 @@ class ValidationAgent:
     - Provide actionable recommendations
     """
 
-    def __init__(self):
+    def __init__(self, adf_maxlag: Optional[int] = None):
+        """
+        Initialize validation agent.
+
+        Parameters
+        ----------
+        adf_maxlag : int, optional
+            Fixed lag order for the ADF test. Defaults to the Schwert rule
+            12 * (n / 100) ** 0.25, capped at 12.
+        """
+        self.adf_maxlag = adf_maxlag
         self.data = None
         self.target_col = None
         self.date_col = None
         self.validation_results = {}
         self.warnings = []
         self.recommendations = []
+        self._target_series = None
+        self._target = None
+        self._n = 0
+        self._cache: Dict[tuple, Dict] = {}
+
+    _CACHE_SIZE = 32
 
     def validate(
         self,
@@ -57,11 +181,34 @@ class ValidationAgent:
         -------
         dict with validation results, warnings, and recommendations
         """
+        # Identical data and arguments give identical results - reuse them
+        columns = [target_col] + [c for c in (covariate_cols or []) if c in data.columns]
+        cache_key = (
+            data.shape,
+            int(pd.util.hash_pandas_object(data[columns], index=True).sum()),
+            target_col,
+            tuple(covariate_cols or ()),
+            intervention_date
+        )
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            self.data = data
+            self.target_col = target_col
+            self.validation_results = copy.deepcopy(cached['validation_results'])
+            self.warnings = list(cached['result']['warnings'])
+            self.recommendations = list(cached['result']['recommendations'])
+            return copy.deepcopy(cached['result'])
+
         self.data = data
         self.target_col = target_col
         self.warnings = []
         self.recommendations = []
 
+        # Target column and its non-missing values as float64, shared by all checks
+        self._target_series = data[target_col]
+        self._target = self._target_series.dropna().to_numpy(dtype=np.float64)
+        self._n = self._target.size
+
         # Reset validation results
         self.validation_results = {
             'overall_score': 0,
@@ -85,7 +232,7 @@ class ValidationAgent:
         # Calculate overall quality score
         self._calculate_overall_score()
 
-        return {
+        result = {
             'success': True,
             'score': self.validation_results['overall_score'],
             'checks': self.validation_results['checks'],
@@ -93,17 +240,40 @@ class ValidationAgent:
             'recommendations': self.recommendations
         }
 
+        if len(self._cache) >= self._CACHE_SIZE:
+            self._cache.pop(next(iter(self._cache)))
+        self._cache[cache_key] = copy.deepcopy({
+            'validation_results': self.validation_results,
+            'result': result
+        })
+
+        return result
+
     def _check_completeness(self):
         """Check for missing values and gaps."""
-        target = self.data[self.target_col]
+        n_total = len(self._target_series)
 
         # Missing values
-        missing_pct = target.isnull().sum() / len(target) * 100
-
-        # Date gaps
-        date_diff = self.data.index.to_series().diff()
-        expected_freq = date_diff.mode()[0] if len(date_diff) > 0 else None
-        gaps = (date_diff > expected_freq * 1.5).sum() if expected_freq else 0
+        missing_pct = (n_total - self._n) / n_total * 100
+
+        # Date gaps - take the expected step from the index frequency when it is
+        # set or can be inferred from the first entries, else from the modal diff
+        index = self.data.index
+        step = None
+        if isinstance(index, pd.DatetimeIndex) and len(index) >= 3:
+            freq = index.freq or pd.infer_freq(index[:min(len(index), 50)])
+            if freq is not None:
+                try:
+                    step = pd.tseries.frequencies.to_offset(freq).nanos
+                except ValueError:
+                    step = None  # calendar offsets (month end etc.) have no fixed step
+
+        if step is not None:
+            gaps = int(np.count_nonzero(np.diff(index.asi8) > 1.5 * step))
+        else:
+            date_diff = index.to_series().diff()
+            expected_freq = date_diff.mode()[0] if len(date_diff) > 0 else None
+            gaps = (date_diff > expected_freq * 1.5).sum() if expected_freq else 0
 
         passed = missing_pct < 5 and gaps == 0
         score = 100 if passed else max(0, 100 - missing_pct * 10 - gaps * 5)
@@ -129,14 +299,18 @@ class ValidationAgent:
 
         Non-stationary series can violate BSTS assumptions.
         """
-        target = self.data[self.target_col].dropna()
-
-        # Augmented Dickey-Fuller test (H0: non-stationary)
-        adf_stat, adf_pvalue, _, _, adf_critical, _ = adfuller(target, autolag='AIC')
+        target = self._target
+        scale = (self._n / 100) ** 0.25
+
+        # Augmented Dickey-Fuller test (H0: non-stationary), at a fixed lag order
+        # rather than searching every lag up to maxlag by AIC
+        maxlag = self.adf_maxlag if self.adf_maxlag is not None else min(12, int(12 * scale))
+        stattools = _lazy('statsmodels.tsa.stattools')
+        adf_stat, adf_pvalue, _, _, adf_critical = stattools.adfuller(target, maxlag=maxlag, autolag=None)
         adf_stationary = adf_pvalue < 0.05
 
-        # KPSS test (H0: stationary)
-        kpss_stat, kpss_pvalue, _, kpss_critical = kpss(target, regression='ct', nlags='auto')
+        # KPSS test (H0: stationary), with the Schwert bandwidth instead of the data-driven search
+        kpss_stat, kpss_pvalue, _, kpss_critical = stattools.kpss(target, regression='ct', nlags=int(4 * scale))
         kpss_stationary = kpss_pvalue > 0.05
 
         # Both tests should agree for confidence
@@ -161,18 +335,17 @@ class ValidationAgent:
 
     def _check_outliers(self):
         """Detect outliers using IQR and Z-score methods."""
-        target = self.data[self.target_col].dropna()
+        target = self._target
 
         # IQR method
-        q1, q3 = target.quantile([0.25, 0.75])
+        q1, q3 = _quartiles(target)
         iqr = q3 - q1
-        outliers_iqr = ((target < q1 - 3 * iqr) | (target > q3 + 3 * iqr)).sum()
+        outliers_iqr = np.count_nonzero((target < q1 - 3 * iqr) | (target > q3 + 3 * iqr))
 
-        # Z-score method
-        z_scores = np.abs(stats.zscore(target))
-        outliers_z = (z_scores > 3).sum()
+        # Z-score method (|x - mean| against 3 population SDs, without a z-score array)
+        outliers_z = np.count_nonzero(np.abs(target - target.mean()) > 3 * target.std())
 
-        outlier_pct = max(outliers_iqr, outliers_z) / len(target) * 100
+        outlier_pct = max(outliers_iqr, outliers_z) / self._n * 100
 
         passed = outlier_pct < 5
         score = 100 if outlier_pct < 2 else max(0, 100 - outlier_pct * 10)
@@ -195,21 +368,19 @@ class ValidationAgent:
 
         Heteroscedasticity can affect credible interval accuracy.
         """
-        target = self.data[self.target_col].dropna()
-        time_idx = np.arange(len(target)).reshape(-1, 1)
+        target = self._target
 
         try:
             # White's test for heteroscedasticity
-            # Regress target on time, then test residuals
-            from sklearn.linear_model import LinearRegression
-            model = LinearRegression()
-            model.fit(time_idx, target)
-            residuals = target - model.predict(time_idx)
+            # Regress target on time (closed-form OLS), then test residuals
+            t_centered = np.arange(self._n, dtype=np.float64)
+            t_centered -= t_centered.mean()
+            residuals = target - (target.mean() + _time_slope(target) * t_centered)
 
             # Split into first and second half
             mid = len(residuals) // 2
-            var1 = residuals[:mid].var()
-            var2 = residuals[mid:].var()
+            var1 = residuals[:mid].var(ddof=1)
+            var2 = residuals[mid:].var(ddof=1)
 
             # F-test for variance ratio
             f_stat = var2 / var1 if var1 > 0 else np.inf
@@ -243,13 +414,13 @@ class ValidationAgent:
         Strong autocorrelation is expected in time series but excessive
         autocorrelation in residuals indicates model misspecification.
         """
-        target = self.data[self.target_col].dropna()
+        target = self._target
 
         # Ljung-Box test for autocorrelation
-        lb_result = acorr_ljungbox(target, lags=[7, 14, 30], return_df=True)
+        lb_pvalues = _ljung_box_pvalues(target, [lag for lag in (7, 14, 30) if lag < self._n])
 
         # Check if significant autocorrelation exists
-        significant_lags = (lb_result['lb_pvalue'] < 0.05).sum()
+        significant_lags = sum(p < 0.05 for p in lb_pvalues.values())
 
         # Some autocorrelation is expected, but not at all lags
         passed = significant_lags >= 1 and significant_lags <= 2
@@ -259,7 +430,7 @@ class ValidationAgent:
             'passed': passed,
             'score': score,
             'significant_lags': int(significant_lags),
-            'lb_pvalues': lb_result['lb_pvalue'].to_dict()
+            'lb_pvalues': lb_pvalues
         }
 
         if significant_lags == 0:
@@ -274,14 +445,23 @@ class ValidationAgent:
 
         CRITICAL for Nielsen case: Flight availability caused structural break!
         """
-        target = self.data[self.target_col].dropna()
+        target = self._target
 
-        # Convert intervention date
-        intervention_idx = self.data.index.get_loc(pd.to_datetime(intervention_date))
+        # Convert intervention date (binary search on the sorted index)
+        try:
+            intervention_idx = _intervention_position(self.data.index, intervention_date)
+        except (ValueError, KeyError) as e:
+            self.validation_results['checks']['structural_break'] = {
+                'passed': None,
+                'score': 50,
+                'error': str(e)
+            }
+            self.warnings.append(f"⚠️ Structural break check skipped: {e}")
+            return
 
         # Split data
-        pre = target.iloc[:intervention_idx]
-        post = target.iloc[intervention_idx:]
+        pre = target[:intervention_idx]
+        post = target[intervention_idx:]
 
         if len(pre) < 10 or len(post) < 10:
             self.validation_results['checks']['structural_break'] = {
@@ -293,18 +473,15 @@ class ValidationAgent:
 
         # CUSUM test
         pre_mean = pre.mean()
-        pre_std = pre.std()
+        pre_std = pre.std(ddof=1)
 
         # Standardized cumulative sum
-        cusum = np.cumsum((target - pre_mean) / pre_std)
-        cusum_pre = cusum[:intervention_idx]
-        cusum_post = cusum[intervention_idx:]
+        pre_cusum_range, last_pre, first_post = _cusum_stats(target, pre_mean, pre_std, intervention_idx)
 
         # Check for break at intervention point
-        break_magnitude = abs(cusum_post.iloc[0] - cusum_pre.iloc[-1]) if len(cusum_post) > 0 else 0
+        break_magnitude = abs(first_post - last_pre) if first_post is not None else 0
 
         # Also check for breaks BEFORE intervention (the Nielsen problem!)
-        pre_cusum_range = cusum_pre.max() - cusum_pre.min()
         early_break_detected = pre_cusum_range > 3 * np.sqrt(len(pre))
 
         passed = not early_break_detected
@@ -333,38 +510,51 @@ class ValidationAgent:
         1. Change around intervention time (like Nielsen flight availability!)
         2. Correlate with target metric
         """
-        target = self.data[self.target_col]
+        cols = [col for col in covariate_cols if col in self.data.columns]
+        window = 30
 
         confounder_analysis = {}
 
-        for col in covariate_cols:
-            if col not in self.data.columns:
-                continue
-
-            covariate = self.data[col].dropna()
-
-            # Correlation with target
-            correlation = target.corr(covariate)
-
-            # Check for changes in covariate over time
-            rolling_mean = covariate.rolling(window=30, min_periods=10).mean()
-            mean_change = abs(rolling_mean.iloc[-1] - rolling_mean.iloc[0]) / rolling_mean.iloc[0] if rolling_mean.iloc[0] != 0 else 0
-
-            # Flag as potential confounder if:
-            # - Moderate to strong correlation (|r| > 0.3)
-            # - Changed significantly over time (>20%)
-            is_confounder = abs(correlation) > 0.3 and mean_change > 0.2
-
-            confounder_analysis[col] = {
-                'correlation': float(correlation),
-                'mean_change_pct': float(mean_change * 100),
-                'is_potential_confounder': is_confounder
-            }
+        if cols:
+            covariates = self.data[cols]
+
+            # Correlation of every covariate with the target, each over the rows
+            # where both are present (pairwise-complete, independent of the
+            # other covariates' missingness)
+            correlations = covariates.corrwith(self._target_series).to_numpy(dtype=np.float64)
+
+            # Check for changes in covariates over time: first vs last 30 non-missing
+            # values of each covariate, selected by each column's running count
+            matrix = covariates.to_numpy(dtype=np.float64)
+            present = ~np.isnan(matrix)
+            rank = np.cumsum(present, axis=0)
+            counts = present.sum(axis=0)
+            values = np.where(present, matrix, 0.0)
+            first = present & (rank <= window)
+            last = present & (rank > counts - window)
+            first_means = (values * first).sum(axis=0) / np.maximum(first.sum(axis=0), 1)
+            last_means = (values * last).sum(axis=0) / np.maximum(last.sum(axis=0), 1)
+
+            mean_changes = np.zeros(len(cols))
+            np.divide(np.abs(last_means - first_means), first_means,
+                      out=mean_changes, where=(counts >= 10) & (first_means != 0))
+
+            for col, correlation, mean_change in zip(cols, correlations, mean_changes):
+                # Flag as potential confounder if:
+                # - Moderate to strong correlation (|r| > 0.3)
+                # - Changed significantly over time (>20%)
+                is_confounder = bool(abs(correlation) > 0.3 and mean_change > 0.2)
+
+                confounder_analysis[col] = {
+                    'correlation': float(correlation),
+                    'mean_change_pct': float(mean_change * 100),
+                    'is_potential_confounder': is_confounder
+                }
 
-            if is_confounder:
-                self.warnings.append(f"🔍 Potential confounder detected: {col}")
-                self.warnings.append(f"   Correlation: {correlation:.2f}, Changed by {mean_change*100:.1f}%")
-                self.recommendations.append(f"✅ Include '{col}' as covariate in BSTS model")
+                if is_confounder:
+                    self.warnings.append(f"🔍 Potential confounder detected: {col}")
+                    self.warnings.append(f"   Correlation: {correlation:.2f}, Changed by {mean_change*100:.1f}%")
+                    self.recommendations.append(f"✅ Include '{col}' as covariate in BSTS model")
 
         n_confounders = sum(1 for v in confounder_analysis.values() if v['is_potential_confounder'])
 
@@ -388,24 +578,25 @@ class ValidationAgent:
 
         High multicollinearity makes coefficient interpretation difficult.
         """
-        from statsmodels.stats.outliers_influence import variance_inflation_factor
-
         # Select only numeric covariates that exist
         available_cols = [col for col in covariate_cols if col in self.data.columns]
         if len(available_cols) < 2:
             return
 
-        X = self.data[available_cols].dropna()
+        X = self.data[available_cols].dropna().to_numpy(dtype=np.float64)
 
         if len(X) < 10:
             return
 
         try:
-            # Calculate VIF for each covariate
-            vif_data = {}
-            for i, col in enumerate(X.columns):
-                vif = variance_inflation_factor(X.values, i)
-                vif_data[col] = float(vif)
+            # VIFs are the diagonal of the inverse correlation matrix (one inversion
+            # instead of one auxiliary regression per covariate)
+            corr = np.corrcoef(X, rowvar=False)
+            try:
+                corr_inv = np.linalg.inv(corr)
+            except np.linalg.LinAlgError:
+                corr_inv = np.linalg.pinv(corr)
+            vif_data = dict(zip(available_cols, np.diag(corr_inv).tolist()))
 
             max_vif = max(vif_data.values())
 
@@ -436,28 +627,16 @@ class ValidationAgent:
         """Calculate weighted overall quality score."""
         checks = self.validation_results['checks']
 
-        # Weights for each check
-        weights = {
-            'completeness': 0.25,
-            'stationarity': 0.15,
-            'outliers': 0.15,
-            'heteroscedasticity': 0.10,
-            'autocorrelation': 0.10,
-            'structural_break': 0.20,  # High weight - critical!
-            'confounders': 0.15,
-            'multicollinearity': 0.10
-        }
-
-        total_score = 0
-        total_weight = 0
-
-        for check, weight in weights.items():
-            if check in checks and checks[check].get('score') is not None:
-                total_score += checks[check]['score'] * weight
-                total_weight += weight
+        scores = np.array([
+            np.nan if checks.get(name, {}).get('score') is None else checks[name]['score']
+            for name in _CHECK_NAMES
+        ], dtype=np.float64)
+        mask = ~np.isnan(scores)
+        total_weight = _CHECK_WEIGHTS[mask].sum()
 
         # Normalize to 0-100
-        self.validation_results['overall_score'] = round(total_score / total_weight if total_weight > 0 else 0, 1)
+        overall = np.dot(scores[mask], _CHECK_WEIGHTS[mask]) / total_weight if total_weight > 0 else 0
+        self.validation_results['overall_score'] = round(float(overall), 1)
 
     def check_did_assumptions(
         self,
@@ -483,32 +662,32 @@ class ValidationAgent:
         -------
         dict with DID assumption tests and violations
         """
-        intervention_idx = treatment_data.index.get_loc(pd.to_datetime(intervention_date))
+        # Sorted-index binary search; raises if unsorted or the date is missing
+        intervention_idx = _intervention_position(treatment_data.index, intervention_date)
 
-        # Pre-period data
-        treat_pre = treatment_data.iloc[:intervention_idx]
-        control_pre = control_data.iloc[:intervention_idx]
+        # Pre-period data, as float arrays (both series share the same time positions)
+        treat_pre = treatment_data.to_numpy(dtype=np.float64)[:intervention_idx]
+        control_pre = control_data.to_numpy(dtype=np.float64)[:intervention_idx]
 
         # Test 1: Parallel trends
         # Regress both series on time, compare slopes
-        time_idx = np.arange(len(treat_pre))
-        treat_slope = np.polyfit(time_idx, treat_pre, 1)[0]
-        control_slope = np.polyfit(time_idx, control_pre, 1)[0]
+        treat_slope = _time_slope(treat_pre)
+        control_slope = _time_slope(control_pre)
 
         slope_diff_pct = abs(treat_slope - control_slope) / abs(treat_slope) * 100 if treat_slope != 0 else np.inf
         parallel_trends_passed = slope_diff_pct < 20  # Slopes within 20%
 
         # Test 2: Common shocks
         # Check correlation of first differences
-        treat_diff = treat_pre.diff().dropna()
-        control_diff = control_pre.diff().dropna()
-        shock_correlation = treat_diff.corr(control_diff)
+        shock_correlation = np.corrcoef(np.diff(treat_pre), np.diff(control_pre))[0, 1]
         common_shocks_passed = shock_correlation > 0.5
 
         # Test 3: No compositional changes
         # Check for structural breaks in control group (Nielsen problem!)
-        control_cusum = np.cumsum((control_pre - control_pre.mean()) / control_pre.std())
-        control_break_detected = (control_cusum.max() - control_cusum.min()) > 3 * np.sqrt(len(control_pre))
+        control_cusum_range, _, _ = _cusum_stats(
+            control_pre, control_pre.mean(), control_pre.std(ddof=1), control_pre.size
+        )
+        control_break_detected = control_cusum_range > 3 * np.sqrt(len(control_pre))
         no_composition_changes = not control_break_detected
 
         # Overall DID validity
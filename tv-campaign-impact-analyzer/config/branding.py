@@ -3,8 +3,12 @@ Electric Glue Branding Configuration
 For TV Campaign Impact Analyzer
 """
 
+import re
+from functools import lru_cache
+from types import MappingProxyType
+
 # Electric Glue Brand Colors
-BRAND_COLORS = {
+BRAND_COLORS = MappingProxyType({
     'primary': '#FF6B35',      # Electric Glue Orange
     'secondary': '#004E89',    # Electric Glue Blue
     'accent': '#F7B801',       # Electric Glue Yellow
@@ -15,7 +19,7 @@ BRAND_COLORS = {
     'danger': '#EF476F',       # Error red
     'text': '#1A1A1D',         # Primary text
     'text_light': '#6C757D'    # Secondary text
-}
+})
 
 # Streamlit Custom CSS
 CUSTOM_CSS = """
@@ -221,6 +225,21 @@ CUSTOM_CSS = """
 </style>
 """
 
+# Strip comments and indentation from the stylesheet once at import; the
+# readable source above is what gets edited, the minified form is what ships
+_CSS_COMMENT = re.compile(r"/\*.*?\*/", re.S)
+_CSS_SPACE = re.compile(r"\s+")
+_CSS_PUNCT_SPACE = re.compile(r"\s*([{};])\s*")
+
+
+def _minify_css(css: str) -> str:
+    """Remove comments and redundant whitespace from a ``<style>`` block."""
+    css = _CSS_SPACE.sub(" ", _CSS_COMMENT.sub("", css))
+    return _CSS_PUNCT_SPACE.sub(r"\1", css).strip()
+
+
+CUSTOM_CSS = _minify_css(CUSTOM_CSS)
+
 # Page Configuration
 PAGE_CONFIG = {
     "page_title": "TV Campaign Impact Analyzer | Electric Glue",
@@ -230,8 +249,7 @@ PAGE_CONFIG = {
 }
 
 # Header HTML
-def get_header_html():
-    return """
+HEADER_HTML = """
     <div class="main-header">
         <h1>📺 TV Campaign Impact Analyzer</h1>
         <p>Agentic Bayesian Analysis for Television Advertising ROI</p>
@@ -239,9 +257,11 @@ def get_header_html():
     </div>
     """
 
+def get_header_html():
+    return HEADER_HTML
+
 # Footer HTML
-def get_footer_html():
-    return """
+FOOTER_HTML = """
     <div class="footer">
         <p><strong class="brand-name">Electric Glue</strong> | AI-First Marketing Intelligence</p>
         <p style="font-size: 0.9rem; margin-top: 0.5rem;">
@@ -253,9 +273,11 @@ def get_footer_html():
     </div>
     """
 
+def get_footer_html():
+    return FOOTER_HTML
+
 # Sidebar branding
-def get_sidebar_html():
-    return """
+SIDEBAR_HTML = """
     <div style="padding: 1rem; background: linear-gradient(135deg, #FF6B35 0%, #004E89 100%); border-radius: 10px; margin-bottom: 1rem;">
         <h3 style="color: white; margin: 0; font-size: 1.3rem;">Electric Glue</h3>
         <p style="color: rgba(255,255,255,0.9); font-size: 0.85rem; margin: 0.3rem 0 0 0;">
@@ -264,51 +286,51 @@ def get_sidebar_html():
     </div>
     """
 
+def get_sidebar_html():
+    return SIDEBAR_HTML
+
 # Agent status display
+_STATUS_ICON = MappingProxyType({
+    'waiting': '⏸️',
+    'running': '🔄',
+    'complete': '✅'
+})
+_STATUS_TEXT = MappingProxyType({
+    'waiting': 'Waiting',
+    'running': 'Running',
+    'complete': 'Complete'
+})
+_AGENT_STATUS_FMT = '<span class="agent-status agent-{status}">{icon} {name}: {text}</span>'
+
+
+@lru_cache(maxsize=256)
 def get_agent_status_html(agent_name, status):
     """
     Generate HTML for agent status display
     status: 'waiting', 'running', 'complete'
     """
-    status_class = f"agent-{status}"
-    status_icon = {
-        'waiting': '⏸️',
-        'running': '🔄',
-        'complete': '✅'
-    }
-    status_text = {
-        'waiting': 'Waiting',
-        'running': 'Running',
-        'complete': 'Complete'
-    }
+    return _AGENT_STATUS_FMT.format(
+        status=status, icon=_STATUS_ICON[status], name=agent_name, text=_STATUS_TEXT[status]
+    )
+
+# Quality indicator: (css class, label, icon) per band
+_QUALITY_EXCELLENT = ("quality-excellent", "Excellent", "🟢")
+_QUALITY_GOOD = ("quality-good", "Good", "🟡")
+_QUALITY_POOR = ("quality-poor", "Needs Attention", "🔴")
+_QUALITY_FMT = '<span class="{cls}">{icon} Data Quality: {text} ({score}%)</span>'
 
-    return f"""
-    <span class="agent-status {status_class}">
-        {status_icon[status]} {agent_name}: {status_text[status]}
-    </span>
-    """
 
-# Quality indicator
+@lru_cache(maxsize=128)
 def get_quality_html(quality_score):
     """
     Generate HTML for data quality indicator
     quality_score: 0-100
     """
     if quality_score >= 80:
-        quality_class = "quality-excellent"
-        quality_text = "Excellent"
-        icon = "🟢"
+        quality_class, quality_text, icon = _QUALITY_EXCELLENT
     elif quality_score >= 60:
-        quality_class = "quality-good"
-        quality_text = "Good"
-        icon = "🟡"
+        quality_class, quality_text, icon = _QUALITY_GOOD
     else:
-        quality_class = "quality-poor"
-        quality_text = "Needs Attention"
-        icon = "🔴"
-
-    return f"""
-    <span class="{quality_class}">
-        {icon} Data Quality: {quality_text} ({quality_score}%)
-    </span>
-    """
+        quality_class, quality_text, icon = _QUALITY_POOR
+
+    return _QUALITY_FMT.format(cls=quality_class, icon=icon, text=quality_text, score=quality_score)
@@ -0,0 +1,61 @@
+"""
+JSON export must not depend on whether the optional orjson package is installed.
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pd = pytest.importorskip("pandas")
+pytest.importorskip("dotenv")  # imported by the agents package
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from agents.analysis_agent import AnalysisAgent
+
+
+def _fitted_agent() -> AnalysisAgent:
+    """An agent with hand-made results, including NaN, numpy scalars and dates."""
+    index = pd.date_range("2024-01-01", periods=5, freq="D")
+    agent = AnalysisAgent()
+    agent.data = pd.DataFrame({"bookings": [10.0, 12.0, np.nan, 15.0, 16.0]}, index=index)
+    agent._counterfactual_arr = np.array([10.0, 11.0, 12.0, 13.0, 14.0])
+    agent.results = {
+        "success": True,
+        "model_spec": {"target_col": "bookings"},
+        "causal_effect": {
+            "average_effect": np.float64(1.5),
+            "relative_effect": np.float64(np.nan),
+            "p_value": 0.01,
+            "n_post": np.int64(3),
+            "intervention_date": pd.Timestamp("2024-01-03"),
+        },
+    }
+    agent.diagnostics = {"pre_period_r2": np.float64(np.inf), "flags": np.array([True, False])}
+    return agent
+
+
+def test_json_export_matches_with_and_without_orjson(tmp_path, monkeypatch):
+    pytest.importorskip("orjson")
+    agent = _fitted_agent()
+
+    with_orjson = tmp_path / "with_orjson.json"
+    agent.export_results(str(with_orjson), format="json")
+
+    # A None entry in sys.modules makes `import orjson` raise ImportError
+    monkeypatch.setitem(sys.modules, "orjson", None)
+    without_orjson = tmp_path / "without_orjson.json"
+    agent.export_results(str(without_orjson), format="json")
+
+    exported = json.loads(with_orjson.read_text(encoding="utf-8"))
+    assert exported == json.loads(without_orjson.read_text(encoding="utf-8"))
+
+    # Strict JSON: NaN/inf as null, dates as ISO 8601 strings
+    assert exported["causal_effect"]["relative_effect"] is None
+    assert exported["diagnostics"]["pre_period_r2"] is None
+    assert exported["causal_effect"]["intervention_date"] == "2024-01-03T00:00:00"
+    assert exported["detailed_results"][0]["date"] == "2024-01-01T00:00:00"
+    assert exported["detailed_results"][2]["actual"] is None